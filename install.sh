@@ -7,21 +7,6 @@ echo "🔔 HeyClaude Installer"
 echo "======================"
 echo ""
 
-# Check for Homebrew
-if ! command -v brew &> /dev/null; then
-    echo "❌ Homebrew not found. Please install Homebrew first:"
-    echo "   https://brew.sh"
-    exit 1
-fi
-
-# Install terminal-notifier if not present
-if ! command -v terminal-notifier &> /dev/null; then
-    echo "📦 Installing terminal-notifier..."
-    brew install terminal-notifier
-else
-    echo "✓ terminal-notifier already installed"
-fi
-
 # Create virtual environment if not in one
 if [ -z "$VIRTUAL_ENV" ]; then
     echo ""
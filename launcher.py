@@ -12,7 +12,10 @@ else:
     # Running as script
     base_path = Path(__file__).parent
 
-sys.path.insert(0, str(base_path / 'src'))
+# Only add src once, so heyclaude is never importable under two sys.path roots
+src_path = str(base_path / 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 from heyclaude.app import main
 
@@ -25,7 +25,7 @@ OPTIONS = {
         "rumps",
         "flask",
         "yaml",
-        "telegram",
+        "orjson",
         "objc",
         "AppKit",
         "Foundation",
@@ -0,0 +1,6 @@
+"""Allow running HeyClaude with ``python -m heyclaude``."""
+
+from heyclaude.app import main
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,113 @@
 """Main HeyClaude menubar application."""
 
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Final, TypedDict
 
 import rumps
 
 from .config import get_config, get_log_path
-from .hooks import install_hook, is_hook_installed
-from .notifier import check_terminal_notifier_installed, send_notification
+from .hooks import install_hook
+from .notifier import send_notification
 from .server import NotificationServer
-from .telegram_bot import TelegramNotifier
 from .terminal import activate_terminal, get_system_idle_time, is_screen_locked
 from .transcript import get_project_name, parse_transcript
 
+if TYPE_CHECKING:
+    from .telegram_bot import TelegramNotifier
+
 logger = logging.getLogger(__name__)
 
 
+class NotificationPayload(TypedDict, total=False):
+    """JSON body Claude Code's Notification hook posts to /notification."""
+
+    notification_type: str
+    cwd: str
+    message: str
+    session_id: str
+    transcript_path: str
+
+
+_TEST_NOTIFICATION_DATA: Final[NotificationPayload] = {
+    "notification_type": "idle_prompt",
+    "cwd": "/Users/test/project",
+    "message": "This is a test notification from HeyClaude",
+    "session_id": "test",
+    "transcript_path": "",
+}
+
+
+class _NotificationBatcher:
+    """Coalesce notifications that share a key and arrive in a short window.
+
+    The first item for a key opens a window of max_delay seconds; the batch
+    is flushed when the window closes or once it holds max_batch_size items.
+    flush(key, items) is called on the batcher's own thread.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[tuple, list], None],
+        max_batch_size: int = 5,
+        max_delay: float = 0.5,
+    ):
+        self._flush = flush
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._pending: dict[tuple, list] = {}
+        self._deadlines: dict[tuple, float] = {}
+        self._ready: list[tuple[tuple, list]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="heyclaude-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, key: tuple, item):
+        """Queue an item under key."""
+        with self._lock:
+            items = self._pending.setdefault(key, [])
+            items.append(item)
+            if len(items) >= self._max_batch_size:
+                # Full batch: hand it off now and start a new window
+                del self._pending[key]
+                self._deadlines.pop(key, None)
+                self._ready.append((key, items))
+            elif len(items) == 1:
+                self._deadlines[key] = time.monotonic() + self._max_delay
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                due = [key for key, deadline in self._deadlines.items() if deadline <= now]
+                batches, self._ready = self._ready, []
+                for key in due:
+                    del self._deadlines[key]
+                    batches.append((key, self._pending.pop(key)))
+                next_deadline = min(self._deadlines.values(), default=None)
+
+            for key, items in batches:
+                try:
+                    self._flush(key, items)
+                except Exception as e:
+                    logger.error(f"Error flushing notification batch: {e}")
+
+            timeout = None if next_deadline is None else max(0.0, next_deadline - time.monotonic())
+            self._wakeup.wait(timeout=timeout)
+            self._wakeup.clear()
+
+
 class HeyClaude(rumps.App):
     """HeyClaude menubar application."""
 
@@ -25,6 +116,7 @@ class HeyClaude(rumps.App):
 
         self.config = get_config()
         self._setup_logging()
+        self._refresh_type_filters()
 
         self.server = NotificationServer(
             host=self.config.server_host,
@@ -34,6 +126,16 @@ class HeyClaude(rumps.App):
         self.server.set_permission_handler(self._handle_permission_request)
 
         self._telegram: TelegramNotifier | None = None
+        self._idle_cache: tuple[float, float] = (0.0, 0.0)  # (monotonic timestamp, idle seconds)
+
+        # Notification delivery (subprocesses, Telegram HTTPS) runs here so the
+        # hook endpoints return without waiting on it
+        self._dispatch_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="heyclaude-dispatch"
+        )
+
+        # Permission requests bypass this: each one needs its own buttons
+        self._telegram_batcher = _NotificationBatcher(self._flush_telegram_batch)
 
         self._build_menu()
 
@@ -56,19 +158,73 @@ class HeyClaude(rumps.App):
 
         level = logging.DEBUG if self.config.debug else logging.INFO
 
-        logging.basicConfig(
-            level=level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler(log_path),
-                logging.StreamHandler(),
-            ],
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        file_handler = logging.FileHandler(log_path)
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        # Callers only enqueue records; file and stderr writes happen on the
+        # listener's thread so the server and dispatch threads never block on them
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
         )
+        self._log_listener.start()
+
+    def _ensure_telegram(self):
+        """Create, replace or stop the Telegram notifier to match the config."""
+        cfg = self.config
+        telegram = self._telegram
+        wanted = cfg.telegram_enabled and cfg.telegram_bot_token and cfg.telegram_chat_id
+
+        if telegram is not None:
+            if wanted and (telegram.bot_token, telegram.chat_id) == (
+                cfg.telegram_bot_token,
+                cfg.telegram_chat_id,
+            ):
+                return
+            # Joining the polling thread can take a moment; keep it off the caller
+            self._telegram = None
+            self._submit(telegram.stop_polling)
+
+        if not wanted:
+            return
+
+        from .telegram_bot import TelegramNotifier
+
+        self._telegram = TelegramNotifier(
+            bot_token=cfg.telegram_bot_token,
+            chat_id=cfg.telegram_chat_id,
+            on_open_terminal=lambda: activate_terminal(self.config.terminal_app),
+            server_url=self._server_url,
+            on_permission_decision=self.server.respond_permission,
+            executor=self._dispatch_pool,
+        )
+        # Start polling for button callbacks
+        self._telegram.start_polling()
+
+    @cached_property
+    def _server_url(self) -> str:
+        """Base URL of the local notification server."""
+        return f"http://{self.config.server_host}:{self.config.server_port}"
+
+    def _refresh_type_filters(self):
+        """Rebuild the per-notification-type enabled map from the config."""
+        self._type_enabled = {
+            "idle_prompt": self.config.idle_notifications,
+            "permission_prompt": self.config.permission_notifications,
+        }
 
     def _build_menu(self):
         """Build the menubar menu."""
+        self._status_item = rumps.MenuItem("Status: Running", callback=None)
         self.menu = [
-            rumps.MenuItem("Status: Running", callback=None),
+            self._status_item,
             None,
             rumps.MenuItem("Preferences...", callback=self._show_preferences),
             None,
@@ -87,18 +243,15 @@ class HeyClaude(rumps.App):
         else:
             status = "Status: Stopped"
 
-        self.menu["Status: Running"].title = status
+        self._status_item.title = status
 
-    def _handle_notification(self, data: dict):
+    def _handle_notification(self, data: NotificationPayload):
         """Handle incoming notification from Claude Code."""
         notification_type = data.get("notification_type", "")
 
         # Check if we should process this notification based on type
-        if notification_type == "idle_prompt" and not self.config.idle_notifications:
-            logger.debug("Ignoring idle_prompt notification (disabled in settings)")
-            return
-        if notification_type == "permission_prompt" and not self.config.permission_notifications:
-            logger.debug("Ignoring permission_prompt notification (disabled in settings)")
+        if not self._type_enabled.get(notification_type, True):
+            logger.debug(f"Ignoring {notification_type} notification (disabled in settings)")
             return
 
         logger.info(f"Processing notification: {notification_type}")
@@ -107,30 +260,42 @@ class HeyClaude(rumps.App):
         transcript_path = data.get("transcript_path", "")
         message = data.get("message", "Claude needs your input")
 
+        # Transcript parsing and delivery happen off the server thread
+        self._submit(self._dispatch_notification, cwd, transcript_path, message, notification_type)
+
+    def _dispatch_notification(
+        self,
+        cwd: str,
+        transcript_path: str,
+        message: str,
+        notification_type: str,
+    ):
+        """Deliver a notification (runs on the dispatch pool)."""
+        cfg = self.config
         project = get_project_name(cwd) if cwd else "Claude Code"
 
         context = None
         if transcript_path:
             context = parse_transcript(
-                transcript_path, max_lines=self.config.telegram_context_lines
+                transcript_path, max_lines=cfg.telegram_context_lines
             )
 
         # Always send macOS notification
-        if self.config.macos_enabled:
+        if cfg.macos_enabled:
             self._send_macos_notification(project, message, cwd, context)
 
         # Only send Telegram notification if idle time requirement is met or screen is locked
-        if self.config.telegram_enabled:
+        if cfg.telegram_enabled:
             should_send = False
             # Check screen lock first (bypasses idle time)
-            if self.config.telegram_send_on_screen_lock and is_screen_locked():
+            if cfg.telegram_send_on_screen_lock and is_screen_locked():
                 logger.info("Screen is locked, sending Telegram immediately")
                 should_send = True
             else:
                 # Fall back to idle time check
-                idle_required = self.config.telegram_idle_time_required
+                idle_required = cfg.telegram_idle_time_required
                 if idle_required > 0:
-                    system_idle = get_system_idle_time()
+                    system_idle = self._get_cached_idle()
                     if system_idle >= idle_required:
                         logger.info(f"System idle {system_idle:.0f}s >= {idle_required}s, sending Telegram")
                         should_send = True
@@ -144,12 +309,28 @@ class HeyClaude(rumps.App):
                     project, cwd, message, context, notification_type
                 )
 
+    def _get_cached_idle(self, ttl: float = 0.2) -> float:
+        """Get the system idle time, reusing a reading taken within ttl seconds."""
+        timestamp, idle = self._idle_cache
+        now = time.monotonic()
+        if now - timestamp < ttl:
+            return idle
+        idle = get_system_idle_time()
+        self._idle_cache = (now, idle)
+        return idle
+
+    def _submit(self, fn, *args):
+        """Run fn on the dispatch pool, logging any exception it raises."""
+        future = self._dispatch_pool.submit(fn, *args)
+        future.add_done_callback(self._log_dispatch_error)
+
+    @staticmethod
+    def _log_dispatch_error(future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error dispatching notification: {future.exception()}")
+
     def _send_macos_notification(self, project: str, message: str, cwd: str, context: str | None = None):
         """Send a macOS notification."""
-        if not check_terminal_notifier_installed():
-            logger.warning("terminal-notifier not installed")
-            return
-
         title = f"Claude Code - {project}"
 
         # Build notification body with context
@@ -179,35 +360,52 @@ class HeyClaude(rumps.App):
         context: str | None,
         notification_type: str = "",
     ):
-        """Send a Telegram notification."""
-        if not self.config.telegram_bot_token or not self.config.telegram_chat_id:
+        """Queue a Telegram notification; bursts from one project are coalesced."""
+        self._telegram_batcher.add((project, notification_type), (cwd, message, context))
+
+    def _flush_telegram_batch(self, key: tuple[str, str], items: list[tuple]):
+        """Send one Telegram message for a batch of queued notifications."""
+        project, notification_type = key
+        cwd, message, context = items[-1]
+        if len(items) > 1:
+            lines = "\n".join(f"- {item_message}" for _, item_message, _ in items)
+            message = f"{len(items)} notifications from {project}:\n{lines}"
+
+        self._submit(
+            self._send_telegram, project, cwd, message, context, notification_type
+        )
+
+    def _send_telegram(
+        self,
+        project: str,
+        cwd: str,
+        message: str,
+        context: str | None,
+        notification_type: str = "",
+        request_id: str | None = None,
+    ):
+        """Send a Telegram notification; permission requests get action buttons."""
+        telegram = self._telegram
+        if telegram is None:
             logger.warning("Telegram not configured")
             return
 
-        if self._telegram is None:
-            server_url = f"http://{self.config.server_host}:{self.config.server_port}"
-            self._telegram = TelegramNotifier(
-                bot_token=self.config.telegram_bot_token,
-                chat_id=self.config.telegram_chat_id,
-                on_open_terminal=lambda: activate_terminal(self.config.terminal_app),
-                server_url=server_url,
-            )
-            # Start polling for button callbacks
-            self._telegram.start_polling()
-
-        self._telegram.send_notification_sync(
+        telegram.send_notification_sync(
             project=project,
             cwd=cwd,
             message=message,
             context=context,
             include_context=self.config.telegram_include_context,
             notification_type=notification_type,
+            request_id=request_id,
         )
 
     def _handle_permission_request(self, data: dict, request_id: str):
         """Handle incoming permission request from Claude Code (blocking endpoint)."""
         logger.info(f"Processing permission request: {request_id}")
 
+        cfg = self.config
+
         cwd = data.get("cwd", "")
         tool_name = data.get("tool_name", "")
         tool_input = data.get("tool_input", {})
@@ -222,47 +420,25 @@ class HeyClaude(rumps.App):
             description = tool_input.get("description", "")
             if description:
                 context = f"# {description}\n$ {command}"
-            else:
+            elif command:
                 context = f"$ {command}"
+            else:
+                context = None
         else:
             message = data.get("message", f"Claude wants to use: {tool_name}")
-            # Format context from tool input
-            context = None
-            if tool_input:
-                context_parts = []
-                for key, value in tool_input.items():
-                    if isinstance(value, str) and len(value) > 200:
-                        value = value[:200] + "..."
-                    context_parts.append(f"{key}: {value}")
-                context = "\n".join(context_parts)
-
-        if self.config.macos_enabled:
-            self._send_macos_notification(project, message, cwd, context)
-
-        # Only send Telegram notification if idle time requirement is met or screen is locked
-        if self.config.telegram_enabled:
-            should_send = False
-            # Check screen lock first (bypasses idle time)
-            if self.config.telegram_send_on_screen_lock and is_screen_locked():
-                logger.info("Screen is locked, sending Telegram permission immediately")
-                should_send = True
-            else:
-                # Fall back to idle time check
-                idle_required = self.config.telegram_idle_time_required
-                if idle_required > 0:
-                    system_idle = get_system_idle_time()
-                    if system_idle >= idle_required:
-                        logger.info(f"System idle {system_idle:.0f}s >= {idle_required}s, sending Telegram permission")
-                        should_send = True
-                    else:
-                        logger.debug(f"Skipping Telegram permission: system idle {system_idle:.0f}s < required {idle_required}s")
-                else:
-                    should_send = True
-
-            if should_send:
-                self._send_telegram_permission(project, cwd, message, context, request_id)
-
-    def _send_telegram_permission(
+            # Format context from tool input, truncating long values before formatting
+            context = "\n".join(
+                f"{key}: {value[:200] + '...' if isinstance(value, str) and len(value) > 200 else value}"
+                for key, value in tool_input.items()
+            ) if tool_input else None
+
+        # Return to the server thread right away; it blocks waiting for the decision
+        if cfg.macos_enabled:
+            self._submit(self._send_macos_notification, project, message, cwd, context)
+        if cfg.telegram_enabled:
+            self._submit(self._dispatch_telegram_permission, project, cwd, message, context, request_id)
+
+    def _dispatch_telegram_permission(
         self,
         project: str,
         cwd: str,
@@ -270,41 +446,57 @@ class HeyClaude(rumps.App):
         context: str | None,
         request_id: str,
     ):
-        """Send a Telegram notification for permission request with action buttons."""
-        if not self.config.telegram_bot_token or not self.config.telegram_chat_id:
-            logger.warning("Telegram not configured")
-            return
+        """Send a permission request to Telegram if the idle/lock gate allows it."""
+        cfg = self.config
 
-        if self._telegram is None:
-            server_url = f"http://{self.config.server_host}:{self.config.server_port}"
-            self._telegram = TelegramNotifier(
-                bot_token=self.config.telegram_bot_token,
-                chat_id=self.config.telegram_chat_id,
-                on_open_terminal=lambda: activate_terminal(self.config.terminal_app),
-                server_url=server_url,
-            )
-            self._telegram.start_polling()
+        # Only send Telegram notification if idle time requirement is met or screen is locked
+        should_send = False
+        # Check screen lock first (bypasses idle time)
+        if cfg.telegram_send_on_screen_lock and is_screen_locked():
+            logger.info("Screen is locked, sending Telegram permission immediately")
+            should_send = True
+        else:
+            # Fall back to idle time check
+            idle_required = cfg.telegram_idle_time_required
+            if idle_required > 0:
+                system_idle = self._get_cached_idle()
+                if system_idle >= idle_required:
+                    logger.info(f"System idle {system_idle:.0f}s >= {idle_required}s, sending Telegram permission")
+                    should_send = True
+                else:
+                    logger.debug(f"Skipping Telegram permission: system idle {system_idle:.0f}s < required {idle_required}s")
+            else:
+                should_send = True
 
-        self._telegram.send_notification_sync(
-            project=project,
-            cwd=cwd,
-            message=message,
-            context=context,
-            include_context=self.config.telegram_include_context,
-            notification_type="permission_prompt",
-            request_id=request_id,
-        )
+        if should_send:
+            self._send_telegram(project, cwd, message, context, "permission_prompt", request_id)
 
     @rumps.clicked("Preferences...")
     def _show_preferences(self, sender):
         """Show the preferences window."""
         from .ui.preferences import show_preferences
 
-        def on_changed():
-            self.config.load()
-            self._update_status()
+        show_preferences(self.config, on_changed=self._reload_config)
 
-        show_preferences(self.config, on_changed=on_changed)
+    def _reload_config(self):
+        """Re-read config.yaml and apply it. Must run on the main thread, like set()."""
+        self.config.load()
+        self._apply_config()
+
+    def _apply_config(self):
+        """Pick up changed settings in the running app."""
+        self._refresh_type_filters()
+        self.__dict__.pop("_server_url", None)
+        self._ensure_telegram()
+        self._update_status()
+
+    def _on_config_file_changed(self):
+        """Called on the config watcher thread after config.yaml was edited externally."""
+        from PyObjCTools import AppHelper
+
+        logger.info("Config file changed on disk, reloading")
+        # Reload on the main thread, so it can't interleave with a Preferences set()
+        AppHelper.callAfter(self._reload_config)
 
     @rumps.clicked("Install Hook")
     def _install_hook(self, sender):
@@ -325,25 +517,24 @@ class HeyClaude(rumps.App):
     @rumps.clicked("Test Notification")
     def _test_notification(self, sender):
         """Send a test notification."""
-        test_data = {
-            "notification_type": "idle_prompt",
-            "cwd": "/Users/test/project",
-            "message": "This is a test notification from HeyClaude",
-            "session_id": "test",
-            "transcript_path": "",
-        }
-        self._handle_notification(test_data)
+        # Copy so the handler can't mutate the shared constant
+        self._handle_notification(NotificationPayload(**_TEST_NOTIFICATION_DATA))
 
     @rumps.clicked("Quit")
     def _quit(self, sender):
         """Quit the application."""
+        self._dispatch_pool.shutdown(wait=False, cancel_futures=True)
         self.server.stop()
+        self._log_listener.stop()
         rumps.quit_application()
 
     def run(self):
         """Start the application."""
         self.server.start()
+        # Connect to Telegram now rather than on the first notification
+        self._ensure_telegram()
         self._update_status()
+        self.config.watch(self._on_config_file_changed)
         logger.info("HeyClaude started")
         super().run()
 
@@ -1,12 +1,25 @@
 """Configuration management for HeyClaude."""
 
+import copy
+import logging
 import os
+import select
+import stat
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable
 
 import yaml
 
-DEFAULT_CONFIG = {
+logger = logging.getLogger(__name__)
+
+# Use the libyaml-backed loader/dumper when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_DEFAULT_CONFIG = {
     "server": {
         "host": "127.0.0.1",
         "port": 8765,
@@ -36,82 +49,313 @@ DEFAULT_CONFIG = {
     "launch_at_login": False,
 }
 
+# Read-only view of the defaults; use _default_config() for a mutable copy
+DEFAULT_CONFIG = MappingProxyType(_DEFAULT_CONFIG)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Atomically replace path with data, unless it already holds exactly that.
+
+    Writes go to a sibling temp file that is then os.replace()d over path,
+    so readers never see a partially written file. A symlinked path is
+    followed, so the link's target is replaced rather than the link itself,
+    and an existing file keeps its permissions.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = path.resolve()
+    try:
+        if path.read_bytes() == data:
+            return False
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    if mode is not None:
+        os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _migrate_legacy_filters(config: dict) -> bool:
+    """
+    Rewrite the old filters.notification_types/all_notifications schema in place.
+
+    Returns:
+        True if anything was migrated
+    """
+    filters = config.get("filters")
+    if not isinstance(filters, dict):
+        return False
+    if "notification_types" not in filters and "all_notifications" not in filters:
+        return False
+
+    types = filters.pop("notification_types", None) or []
+    everything = filters.pop("all_notifications", False)
+    filters.setdefault("idle_notifications", everything or "idle_prompt" in types)
+    filters.setdefault("permission_notifications", everything or "permission_prompt" in types)
+    return True
+
+
+def _default_config() -> dict:
+    """Return a fresh, fully independent copy of the default config."""
+    return copy.deepcopy(_DEFAULT_CONFIG)
+
+
+# Resolved once at import; the home directory doesn't change while we run
+_HOME = Path.home()
+_CONFIG_DIR = _HOME / ".heyclaude"
+_CONFIG_PATH = _CONFIG_DIR / "config.yaml"
+_LOG_PATH = _CONFIG_DIR / "heyclaude.log"
+
 
 def get_config_dir() -> Path:
     """Get the configuration directory path."""
-    return Path.home() / ".heyclaude"
+    return _CONFIG_DIR
 
 
 def get_config_path() -> Path:
     """Get the configuration file path."""
-    return get_config_dir() / "config.yaml"
+    return _CONFIG_PATH
 
 
 def get_log_path() -> Path:
     """Get the log file path."""
-    return get_config_dir() / "heyclaude.log"
+    return _LOG_PATH
 
 
 def deep_merge(base: dict, override: dict) -> dict:
-    """Deep merge override into base dict."""
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
+    """Deep merge override into base dict.
+
+    base is copied once up front and the copy is then merged in place,
+    walking nested dicts with an explicit stack instead of recursion.
+    """
+    result = copy.deepcopy(base)
+    stack = [(result, override)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                stack.append((dst[key], value))
+            else:
+                dst[key] = value
     return result
 
 
+_MISSING = object()
+
+# Types the safe YAML dumper writes as-is
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def _flatten(config: dict) -> dict[str, Any]:
+    """Map every leaf of a nested config dict to its dot-separated key."""
+    flat = {}
+    stack = [("", config)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict):
+                stack.append((f"{path}.", value))
+            else:
+                flat[path] = value
+    return flat
+
+
+@lru_cache(maxsize=64)
+def _split_key(key: str) -> tuple[str, ...]:
+    """Split a dot-separated config key, cached since keys are string literals."""
+    return tuple(key.split("."))
+
+
 class Config:
     """Configuration manager for HeyClaude."""
 
     def __init__(self):
-        self._config = DEFAULT_CONFIG.copy()
+        self._config: dict = {}
+        # Leaf values keyed by dotted path, mirrored from _config for O(1) get()
+        self._flat: dict[str, Any] = {}
+        # Set by set(), whose values may be PyObjC types from the preferences UI
+        self._tainted = False
         self._config_path = get_config_path()
-        self._ensure_config_dir()
+        self._mtime: int | None = None
         self.load()
 
+    def _set_config(self, config: dict):
+        """Replace the config tree and rebuild its flattened mirror."""
+        self._config = config
+        self._flat = _flatten(config)
+        self._tainted = False
+
     def _ensure_config_dir(self):
         """Ensure the config directory exists."""
         self._config_path.parent.mkdir(parents=True, exist_ok=True)
 
     def load(self):
-        """Load configuration from file."""
-        if self._config_path.exists():
-            with open(self._config_path) as f:
-                user_config = yaml.safe_load(f) or {}
-                self._config = deep_merge(DEFAULT_CONFIG, user_config)
-        else:
-            self._config = DEFAULT_CONFIG.copy()
+        """Load configuration from file.
+
+        The parsed file is cached by modification time, so reloading an
+        unchanged file is a single stat() call.
+        """
+        try:
+            mtime = self._config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._set_config(_default_config())
+            self.save()
+            return
+
+        if mtime == self._mtime:
+            return
+
+        with open(self._config_path) as f:
+            user_config = yaml.load(f, Loader=_YamlLoader) or {}
+        migrated = _migrate_legacy_filters(user_config)
+        self._set_config(deep_merge(_DEFAULT_CONFIG, user_config))
+        self._mtime = mtime
+        if migrated:
             self.save()
 
     def save(self):
         """Save configuration to file."""
-        # Convert any PyObjC strings to regular Python strings
-        clean_config = self._convert_to_python_types(self._config)
-        with open(self._config_path, "w") as f:
-            yaml.dump(clean_config, f, default_flow_style=False)
+        # Convert any PyObjC strings to regular Python strings. Only set() can
+        # introduce them; a tree straight from load() is plain Python already.
+        if self._tainted and self._needs_conversion(self._config):
+            # Keep the converted tree so later saves stay on the fast path
+            self._set_config(self._convert_to_python_types(self._config))
+        try:
+            data = yaml.dump(self._config, Dumper=_YamlDumper, default_flow_style=False)
+        except yaml.representer.RepresenterError:
+            # The safe dumper rejects str/int/float subclasses; one got into the
+            # tree without going through set(), so convert all of it
+            self._set_config(self._convert_to_python_types(self._config))
+            data = yaml.dump(self._config, Dumper=_YamlDumper, default_flow_style=False)
+        data = data.encode()
+        self._ensure_config_dir()
+        write_if_changed(self._config_path, data)
+        # What's on disk is already in memory; don't re-parse it on load()
+        self._mtime = self._config_path.stat().st_mtime_ns
+        self._tainted = False
+
+    def watch(self, callback: Callable[[], None]) -> bool:
+        """
+        Call callback whenever config.yaml changes on disk.
+
+        Uses kqueue vnode events, so nothing is polled while the file is
+        untouched. Our own save()s may still trigger the callback, as the
+        watcher can wake before save() records the new mtime; that's harmless,
+        since load() then finds the mtime unchanged and does nothing. The
+        callback runs on the watcher thread and should hand the actual load() to the
+        thread that calls set(), so a reload can't land in the middle of one.
+
+        Returns:
+            True if the watcher was started (False where kqueue isn't available)
+        """
+        if not hasattr(select, "kqueue"):
+            logger.debug("kqueue not available, config file watching disabled")
+            return False
+
+        self._ensure_config_dir()
+        threading.Thread(
+            target=self._watch_loop, args=(callback,), name="heyclaude-config-watch", daemon=True
+        ).start()
+        return True
+
+    def _watch_loop(self, callback: Callable[[], None]):
+        """Block on kqueue events for the config dir and file, reporting changes."""
+        kq = select.kqueue()
+        # The directory sees atomic replaces/creates, the file sees in-place writes
+        dir_fd = os.open(self._config_path.parent, os.O_RDONLY)
+        watch_flags = select.KQ_EV_ADD | select.KQ_EV_CLEAR
+        kq.control(
+            [select.kevent(dir_fd, select.KQ_FILTER_VNODE, watch_flags, select.KQ_NOTE_WRITE)], 0
+        )
+
+        while True:
+            try:
+                file_fd = os.open(self._config_path, os.O_RDONLY)
+            except FileNotFoundError:
+                file_fd = None
+
+            try:
+                if file_fd is not None:
+                    kq.control([select.kevent(
+                        file_fd,
+                        select.KQ_FILTER_VNODE,
+                        watch_flags,
+                        select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND
+                        | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME,
+                    )], 0)
+                kq.control(None, 4)
+            finally:
+                # Closing the fd drops its kevent; the file is re-opened as it may have been replaced
+                if file_fd is not None:
+                    os.close(file_fd)
+
+            try:
+                mtime = self._config_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            # Only compares against _mtime; the config itself is left to load()
+            if mtime != self._mtime:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error handling config change: {e}")
+
+    def _needs_conversion(self, obj) -> bool:
+        """Check whether obj contains anything _convert_to_python_types would change."""
+        if isinstance(obj, dict):
+            return any(self._needs_conversion(k) or self._needs_conversion(v) for k, v in obj.items())
+        elif isinstance(obj, list):
+            return any(self._needs_conversion(v) for v in obj)
+        # Exact type check: PyObjC's NSString/NSNumber proxies subclass str/int/float
+        return type(obj) not in _PLAIN_TYPES
 
     def _convert_to_python_types(self, obj):
-        """Convert PyObjC types to Python native types for YAML serialization."""
+        """Convert PyObjC types to Python native types for YAML serialization.
+
+        Goes by exact type rather than isinstance(), since the safe YAML dumper
+        rejects subclasses of str/int/float such as PyObjC's string and number
+        proxies.
+        """
         if isinstance(obj, dict):
-            return {k: self._convert_to_python_types(v) for k, v in obj.items()}
+            return {
+                self._convert_to_python_types(k): self._convert_to_python_types(v)
+                for k, v in obj.items()
+            }
         elif isinstance(obj, list):
             return [self._convert_to_python_types(v) for v in obj]
-        elif hasattr(obj, '__class__') and 'NSString' in obj.__class__.__name__:
-            return str(obj)
-        elif hasattr(obj, '__class__') and 'NSNumber' in obj.__class__.__name__:
-            return int(obj) if float(obj) == int(obj) else float(obj)
-        elif not isinstance(obj, (str, int, float, bool, type(None))):
+        elif type(obj) in _PLAIN_TYPES:
+            return obj
+        # bool before int, as it's an int subclass
+        elif isinstance(obj, bool):
+            return bool(obj)
+        elif isinstance(obj, str):
             return str(obj)
-        return obj
+        elif isinstance(obj, int):
+            return int(obj)
+        elif isinstance(obj, float):
+            return float(obj)
+        elif hasattr(obj, "__float__"):
+            # Other numbers, e.g. an NSNumber that isn't bridged to a Python number
+            value = float(obj)
+            return int(value) if value.is_integer() else value
+        return str(obj)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a config value by dot-separated key."""
-        keys = key.split(".")
+        value = self._flat.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Not a leaf; walk the tree for section lookups like get("server")
         value = self._config
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
@@ -120,13 +364,18 @@ class Config:
 
     def set(self, key: str, value: Any):
         """Set a config value by dot-separated key."""
-        keys = key.split(".")
+        keys = _split_key(key)
         config = self._config
         for k in keys[:-1]:
             if k not in config:
                 config[k] = {}
             config = config[k]
         config[keys[-1]] = value
+        self._tainted = True
+        if key in self._flat and not isinstance(value, dict):
+            self._flat[key] = value
+        else:
+            self._flat = _flatten(self._config)
         self.save()
 
     @property
@@ -1,23 +1,38 @@
 """Hook installation utilities."""
 
+import copy
 import json
 import logging
-import shutil
+import threading
 from pathlib import Path
 
+try:
+    import orjson
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data: bytes):
+        return json.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+from .config import write_if_changed
+
 logger = logging.getLogger(__name__)
 
 HOOK_SCRIPT = """#!/bin/bash
 # HeyClaude hook for Claude Code
 # Sends notifications to HeyClaude app
 
-# Read JSON from stdin
-INPUT=$(cat)
-
-# POST to HeyClaude server (ignore errors if server is down)
+# Stream the JSON from stdin straight to HeyClaude (ignore errors if server is down)
 curl -s -X POST "http://127.0.0.1:8765/notification" \\
     -H "Content-Type: application/json" \\
-    -d "$INPUT" \\
+    --data-binary @- \\
     --connect-timeout 2 \\
     --max-time 5 \\
     >/dev/null 2>&1 || true
@@ -29,52 +44,86 @@ PERMISSION_HOOK_SCRIPT = """#!/bin/bash
 # HeyClaude permission hook for Claude Code
 # Sends permission requests to HeyClaude app and waits for response
 
-# Read JSON from stdin
-INPUT=$(cat)
-
-# Generate a unique request ID
-REQUEST_ID="perm_$(date +%s)_$$"
-
-# Add request_id to the input JSON
-INPUT_WITH_ID=$(echo "$INPUT" | jq --arg id "$REQUEST_ID" '. + {request_id: $id}')
-
-# POST to HeyClaude server and wait for response (5 minute timeout)
+# Stream the JSON from stdin straight into the request and wait for the
+# decision (5 minute timeout). HeyClaude assigns the request ID itself.
 RESPONSE=$(curl -s -X POST "http://127.0.0.1:8765/permission" \\
     -H "Content-Type: application/json" \\
-    -d "$INPUT_WITH_ID" \\
+    --data-binary @- \\
     --connect-timeout 2 \\
     --max-time 300 \\
     2>/dev/null)
 
-# Extract decision from response
-DECISION=$(echo "$RESPONSE" | jq -r '.decision // empty')
-
-if [ "$DECISION" = "allow" ]; then
-    # Output JSON to approve the action
-    echo '{"decision": "allow"}'
-elif [ "$DECISION" = "deny" ]; then
-    # Output JSON to deny the action
-    echo '{"decision": "deny"}'
-fi
+# Match the decision in bash rather than spawning jq
+case "$RESPONSE" in
+    *'"decision":"allow"'* | *'"decision": "allow"'*)
+        echo '{"decision": "allow"}'
+        ;;
+    *'"decision":"deny"'* | *'"decision": "deny"'*)
+        echo '{"decision": "deny"}'
+        ;;
+esac
 
 # Exit with success regardless (Claude handles the decision)
 exit 0
 """
 
 
+# Resolved once at import; the home directory doesn't change while we run
+_CLAUDE_DIR = Path.home() / ".claude"
+_HOOK_PATH = _CLAUDE_DIR / "hooks" / "heyclaude-hook.sh"
+_PERM_HOOK_PATH = _CLAUDE_DIR / "hooks" / "heyclaude-permission-hook.sh"
+_SETTINGS_PATH = _CLAUDE_DIR / "settings.json"
+
+
 def get_hook_path() -> Path:
     """Get the notification hook script path."""
-    return Path.home() / ".claude" / "hooks" / "heyclaude-hook.sh"
+    return _HOOK_PATH
 
 
 def get_permission_hook_path() -> Path:
     """Get the permission hook script path."""
-    return Path.home() / ".claude" / "hooks" / "heyclaude-permission-hook.sh"
+    return _PERM_HOOK_PATH
 
 
 def get_settings_path() -> Path:
     """Get the Claude Code settings path."""
-    return Path.home() / ".claude" / "settings.json"
+    return _SETTINGS_PATH
+
+
+# (st_mtime_ns, parsed) of the settings.json we last read or wrote. The cached
+# dict is never mutated; it's only ever replaced, under _settings_lock, which
+# also covers the file I/O so the mtime and contents always match.
+_settings_cache: tuple[int, dict] | None = None
+_settings_lock = threading.Lock()
+
+
+def _read_settings(settings_path: Path) -> dict | None:
+    """
+    Parse settings.json, reusing the previous parse if the file is unchanged.
+
+    Returns a copy the caller may modify; save changes with _write_settings().
+
+    Returns:
+        The settings, or None if the file doesn't exist
+    """
+    global _settings_cache
+    with _settings_lock:
+        try:
+            mtime = settings_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        if _settings_cache is None or _settings_cache[0] != mtime:
+            _settings_cache = (mtime, _loads(settings_path.read_bytes()))
+        return copy.deepcopy(_settings_cache[1])
+
+
+def _write_settings(settings_path: Path, settings: dict):
+    """Write settings.json and remember what's on disk now."""
+    global _settings_cache
+    with _settings_lock:
+        write_if_changed(settings_path, _dumps(settings))
+        _settings_cache = (settings_path.stat().st_mtime_ns, settings)
 
 
 def install_hook(
@@ -107,11 +156,7 @@ def install_hook(
         perm_hook_path.chmod(0o755)
 
         settings_path = get_settings_path()
-        settings = {}
-
-        if settings_path.exists():
-            with open(settings_path) as f:
-                settings = json.load(f)
+        settings = _read_settings(settings_path) or {}
 
         if "hooks" not in settings:
             settings["hooks"] = {}
@@ -158,8 +203,7 @@ def install_hook(
             settings["hooks"].pop("Notification", None)
 
         settings_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(settings_path, "w") as f:
-            json.dump(settings, f, indent=2)
+        _write_settings(settings_path, settings)
 
         mode = " + ".join(modes) if modes else "none"
         logger.info(f"Hook installed successfully ({mode})")
@@ -189,35 +233,29 @@ def uninstall_hook() -> tuple[bool, str]:
             perm_hook_path.unlink()
 
         settings_path = get_settings_path()
-        if settings_path.exists():
-            with open(settings_path) as f:
-                settings = json.load(f)
-
-            if "hooks" in settings:
-                # Remove Notification hooks
-                if "Notification" in settings["hooks"]:
-                    notifications = settings["hooks"]["Notification"]
-                    settings["hooks"]["Notification"] = [
-                        n for n in notifications
-                        if not any(str(hook_path) in h.get("command", "") for h in n.get("hooks", []))
-                    ]
-
-                    if not settings["hooks"]["Notification"]:
-                        del settings["hooks"]["Notification"]
-
-                # Remove PermissionRequest hooks
-                if "PermissionRequest" in settings["hooks"]:
-                    perm_hooks = settings["hooks"]["PermissionRequest"]
-                    settings["hooks"]["PermissionRequest"] = [
-                        h for h in perm_hooks
-                        if str(perm_hook_path) not in h.get("command", "")
-                    ]
-
-                    if not settings["hooks"]["PermissionRequest"]:
-                        del settings["hooks"]["PermissionRequest"]
-
-            with open(settings_path, "w") as f:
-                json.dump(settings, f, indent=2)
+        settings = _read_settings(settings_path)
+        if settings is not None:
+
+            hooks = settings.get("hooks", {})
+            # Our script path per event; drop any matcher entry that runs it
+            ours = {
+                "Notification": str(hook_path),
+                "PermissionRequest": str(perm_hook_path),
+            }
+            for event, command in ours.items():
+                entries = hooks.get(event)
+                if entries is None:
+                    continue
+                kept = [
+                    entry for entry in entries
+                    if not any(command in h.get("command", "") for h in entry.get("hooks", []))
+                ]
+                if kept:
+                    hooks[event] = kept
+                else:
+                    del hooks[event]
+
+            _write_settings(settings_path, settings)
 
         logger.info("Hooks uninstalled successfully")
         return True, "Hooks uninstalled"
@@ -233,13 +271,20 @@ def is_hook_installed() -> bool:
     if not hook_path.exists():
         return False
 
-    settings_path = get_settings_path()
-    if not settings_path.exists():
-        return False
-
+    global _settings_cache
     try:
-        with open(settings_path) as f:
-            settings = json.load(f)
+        settings_path = get_settings_path()
+        with _settings_lock:
+            mtime = settings_path.stat().st_mtime_ns
+            if _settings_cache is not None and _settings_cache[0] == mtime:
+                settings = _settings_cache[1]
+            else:
+                data = settings_path.read_bytes()
+                # Cheap prefilter: the hook path can't be registered if it isn't in the file at all
+                if str(hook_path).encode() not in data:
+                    return False
+                settings = _loads(data)
+                _settings_cache = (mtime, settings)
 
         notifications = settings.get("hooks", {}).get("Notification", [])
         for notification in notifications:
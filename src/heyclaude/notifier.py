@@ -1,6 +1,8 @@
 """macOS native notifications via UserNotifications framework."""
 
+import atexit
 import logging
+import subprocess
 import threading
 
 logger = logging.getLogger(__name__)
@@ -10,6 +12,11 @@ _delegate = None
 _center = None
 _terminal_app = "iTerm"
 
+# Long-lived `osascript -i` used by the fallback path, so each notification
+# doesn't pay for spawning a new osascript process
+_osascript_proc: subprocess.Popen | None = None
+_osascript_lock = threading.Lock()
+
 
 def _get_notification_center():
     """Get the shared UNUserNotificationCenter."""
@@ -19,7 +26,6 @@ def _get_notification_center():
         return _center
 
     try:
-        import objc
         from Foundation import NSObject
         import UserNotifications
 
@@ -87,7 +93,7 @@ def send_notification(
         group: Notification identifier (for replacing notifications)
 
     Returns:
-        True if notification was sent successfully
+        True if the notification was handed to the notification center
     """
     global _terminal_app
     _terminal_app = terminal_app
@@ -116,24 +122,15 @@ def send_notification(
             group, content, None  # None trigger = deliver immediately
         )
 
-        # Track completion
-        result = {"success": False, "error": None}
-        done_event = threading.Event()
-
         def completion_handler(error):
             if error:
-                result["error"] = str(error)
                 logger.error(f"Notification failed: {error}")
             else:
-                result["success"] = True
                 logger.info(f"Notification sent: {title}")
-            done_event.set()
 
+        # The center queues the request itself; don't block the caller on delivery
         center.addNotificationRequest_withCompletionHandler_(request, completion_handler)
-
-        # Wait for completion (with timeout)
-        done_event.wait(timeout=5.0)
-        return result["success"]
+        return True
 
     except ImportError:
         logger.error("UserNotifications framework not available")
@@ -143,27 +140,89 @@ def send_notification(
         return _send_via_osascript(title, message, subtitle, sound if sound_enabled else None)
 
 
+def _get_osascript_proc() -> subprocess.Popen:
+    """Get the persistent osascript process, (re)spawning it if needed."""
+    global _osascript_proc
+
+    if _osascript_proc is None or _osascript_proc.poll() is not None:
+        if _osascript_proc is None:
+            atexit.register(_close_osascript_proc)
+        # Interactive mode runs one statement per stdin line. Its prompt and
+        # results on stdout are discarded; errors go to stderr, which a reader
+        # thread drains so the pipe can never fill up and block us.
+        _osascript_proc = subprocess.Popen(
+            ["osascript", "-i"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        threading.Thread(
+            target=_log_osascript_errors,
+            args=(_osascript_proc.stderr,),
+            name="heyclaude-osascript-stderr",
+            daemon=True,
+        ).start()
+    return _osascript_proc
+
+
+def _log_osascript_errors(stderr):
+    """Log what the persistent osascript writes to stderr until it exits."""
+    for line in stderr:
+        line = line.strip()
+        if line:
+            logger.error(f"osascript failed: {line}")
+
+
+def _close_osascript_proc():
+    """Close the persistent osascript process on exit."""
+    if _osascript_proc is not None and _osascript_proc.poll() is None:
+        try:
+            _osascript_proc.stdin.close()
+        except OSError:
+            pass
+
+
+def _escape_applescript(text: str) -> str:
+    """Escape text for use inside a one-line AppleScript string literal."""
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+
+
 def _send_via_osascript(
     title: str,
     message: str,
     subtitle: str | None,
     sound: str | None,
 ) -> bool:
-    """Fallback: Send notification via osascript."""
-    import subprocess
+    """
+    Fallback: Send notification via osascript.
 
+    Through the persistent osascript the script is only handed over, so True
+    means it was written, not that it ran; errors it reports are logged as
+    they arrive.
+    """
     full_message = message
     if subtitle:
         full_message = f"{subtitle}\n{message}"
 
-    title = title.replace('"', '\\"')
-    full_message = full_message.replace('"', '\\"')
+    title = _escape_applescript(title)
+    full_message = _escape_applescript(full_message)
 
     if sound:
         script = f'display notification "{full_message}" with title "{title}" sound name "{sound}"'
     else:
         script = f'display notification "{full_message}" with title "{title}"'
 
+    try:
+        with _osascript_lock:
+            proc = _get_osascript_proc()
+            proc.stdin.write(script + "\n")
+            proc.stdin.flush()
+        logger.info(f"Notification handed to osascript: {title}")
+        return True
+    except (OSError, ValueError) as e:
+        logger.warning(f"Persistent osascript unavailable ({e}), running it once")
+
     try:
         result = subprocess.run(
             ["osascript", "-e", script],
@@ -179,12 +238,3 @@ def _send_via_osascript(
     except Exception as e:
         logger.error(f"osascript error: {e}")
         return False
-
-
-def check_terminal_notifier_installed() -> bool:
-    """Check if native notifications are available."""
-    try:
-        import UserNotifications
-        return True
-    except ImportError:
-        return False
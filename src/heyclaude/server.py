@@ -2,13 +2,47 @@
 
 import logging
 import threading
-import time
+import uuid
 from typing import Callable
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
+
+try:
+    # orjson reads/writes bytes directly and is several times faster than json
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:
+    import json
+    from json import loads as _json_loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on permission requests waiting for a decision at once
+MAX_PENDING_PERMISSIONS = 1024
+
+
+# Constant bodies, serialized once. Response objects themselves are mutable,
+# so a fresh one is still built around these for each request.
+_OK_BODY = _json_dumps({"status": "ok"})
+_HEALTHY_BODY = _json_dumps({"status": "healthy"})
+
+
+def _jsonify(obj) -> Response:
+    """Build a JSON response, like flask.jsonify but serialized with orjson."""
+    return Response(_json_dumps(obj), mimetype="application/json")
+
+
+def _get_json() -> dict:
+    """Parse the request body as a JSON object, or {} if it isn't one."""
+    try:
+        data = _json_loads(request.get_data())
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
 
 class NotificationServer:
     """HTTP server that receives notifications from Claude Code hooks."""
@@ -21,9 +55,10 @@ class NotificationServer:
         self._running = False
         self._notification_handler: Callable | None = None
         self._permission_handler: Callable | None = None
-        # Pending permission requests: request_id -> {"event": Event, "decision": None}
+        # Pending permission requests: request_id -> {"data": ...}, "decision" added once answered
         self._pending_permissions: dict = {}
-        self._permissions_lock = threading.Lock()
+        # One condition shared by all waiters; each checks its own entry's decision
+        self._permissions_cond = threading.Condition()
 
         self._setup_routes()
 
@@ -33,20 +68,20 @@ class NotificationServer:
         @self.app.route("/notification", methods=["POST"])
         def notification():
             try:
-                data = request.get_json(force=True, silent=True) or {}
+                data = _get_json()
                 logger.info(f"Received notification: {data}")
 
                 if self._notification_handler:
                     self._notification_handler(data)
 
-                return jsonify({"status": "ok"})
+                return Response(_OK_BODY, mimetype="application/json")
             except Exception as e:
                 logger.error(f"Error handling notification: {e}")
-                return jsonify({"status": "error", "message": str(e)}), 500
+                return _jsonify({"status": "error", "message": str(e)}), 500
 
         @self.app.route("/health", methods=["GET"])
         def health():
-            return jsonify({"status": "healthy"})
+            return Response(_HEALTHY_BODY, mimetype="application/json")
 
         @self.app.route("/permission", methods=["POST"])
         def permission():
@@ -56,67 +91,86 @@ class NotificationServer:
             or timeout occurs.
             """
             try:
-                data = request.get_json(force=True, silent=True) or {}
-                request_id = data.get("request_id", str(time.time()))
+                data = _get_json()
+                # Older hook scripts send their own ID; otherwise assign one here
+                request_id = data.get("request_id") or f"perm_{uuid.uuid4().hex}"
                 timeout = data.get("timeout", 300)  # 5 minute default timeout
 
                 logger.info(f"Received permission request: {request_id}")
 
-                # Create event for waiting
-                event = threading.Event()
-                with self._permissions_lock:
-                    self._pending_permissions[request_id] = {
-                        "event": event,
-                        "decision": None,
-                        "data": data,
-                    }
-
-                # Notify handler (sends to Telegram)
-                if self._permission_handler:
-                    self._permission_handler(data, request_id)
-
-                # Wait for response or timeout
-                event.wait(timeout=timeout)
-
-                with self._permissions_lock:
-                    pending = self._pending_permissions.pop(request_id, None)
-
-                if pending and pending.get("decision"):
+                pending = {"data": data}
+                with self._permissions_cond:
+                    # Each pending request parks a server thread; refuse rather than pile up
+                    if len(self._pending_permissions) >= MAX_PENDING_PERMISSIONS:
+                        logger.warning(f"Rejecting permission request {request_id}: too many pending")
+                        return _jsonify({"status": "error", "message": "Too many pending requests"}), 503
+                    self._pending_permissions[request_id] = pending
+
+                try:
+                    # Notify handler (sends to Telegram)
+                    if self._permission_handler:
+                        self._permission_handler(data, request_id)
+
+                    # Wait for response or timeout
+                    with self._permissions_cond:
+                        self._permissions_cond.wait_for(
+                            lambda: "decision" in pending, timeout=timeout
+                        )
+                finally:
+                    # Always drop the entry, even if the handler raised
+                    with self._permissions_cond:
+                        self._pending_permissions.pop(request_id, None)
+
+                if pending.get("decision"):
                     decision = pending["decision"]
                     logger.info(f"Permission {request_id} decided: {decision}")
-                    return jsonify({"decision": decision})
+                    return _jsonify({"decision": decision})
                 else:
                     logger.info(f"Permission {request_id} timed out")
-                    return jsonify({"decision": None, "timeout": True})
+                    return _jsonify({"decision": None, "timeout": True})
 
             except Exception as e:
                 logger.error(f"Error handling permission: {e}")
-                return jsonify({"status": "error", "message": str(e)}), 500
+                return _jsonify({"status": "error", "message": str(e)}), 500
 
         @self.app.route("/permission/respond", methods=["POST"])
         def permission_respond():
             """Handle response to a pending permission request."""
             try:
-                data = request.get_json(force=True, silent=True) or {}
+                data = _get_json()
                 request_id = data.get("request_id")
                 decision = data.get("decision")  # "allow", "deny", or specific option
 
                 if not request_id:
-                    return jsonify({"status": "error", "message": "request_id required"}), 400
-
-                with self._permissions_lock:
-                    pending = self._pending_permissions.get(request_id)
-                    if pending:
-                        pending["decision"] = decision
-                        pending["event"].set()
-                        logger.info(f"Permission {request_id} responded: {decision}")
-                        return jsonify({"status": "ok"})
-                    else:
-                        return jsonify({"status": "error", "message": "Request not found or expired"}), 404
+                    return _jsonify({"status": "error", "message": "request_id required"}), 400
+
+                if self.respond_permission(request_id, decision):
+                    return Response(_OK_BODY, mimetype="application/json")
+                return _jsonify({"status": "error", "message": "Request not found or expired"}), 404
 
             except Exception as e:
                 logger.error(f"Error responding to permission: {e}")
-                return jsonify({"status": "error", "message": str(e)}), 500
+                return _jsonify({"status": "error", "message": str(e)}), 500
+
+    def respond_permission(self, request_id: str, decision: str | None) -> bool:
+        """
+        Resolve a pending permission request, waking its /permission call.
+
+        Safe to call from any thread, so in-process callers don't need to go
+        through /permission/respond.
+
+        Returns:
+            True if the request was still pending
+        """
+        with self._permissions_cond:
+            pending = self._pending_permissions.get(request_id)
+            if not pending:
+                return False
+            pending["decision"] = decision
+            self._permissions_cond.notify_all()
+
+        logger.info(f"Permission {request_id} responded: {decision}")
+        return True
 
     def set_notification_handler(self, handler: Callable):
         """Set the handler function for incoming notifications."""
@@ -142,9 +196,17 @@ class NotificationServer:
 
         warnings.filterwarnings("ignore", message=".*development server.*")
 
-        from werkzeug.serving import make_server
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietRequestHandler(WSGIRequestHandler):
+            """Skip werkzeug's per-request access log line; errors are still logged."""
+
+            def log_request(self, code="-", size="-"):
+                pass
 
-        self._server = make_server(self.host, self.port, self.app, threaded=True)
+        self._server = make_server(
+            self.host, self.port, self.app, threaded=True, request_handler=QuietRequestHandler
+        )
         self._server.serve_forever()
 
     def stop(self):
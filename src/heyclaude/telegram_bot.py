@@ -1,14 +1,47 @@
 """Telegram bot integration for Claude Code notifications."""
 
-import asyncio
+import json
 import logging
 import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Callable
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Long-poll timeout in seconds; Telegram holds getUpdates open this long when idle
+POLL_TIMEOUT = 50
+
+# Caps applied before escaping, so escaping only ever touches bounded strings.
+# Together they keep a message well under Telegram's 4096 character limit.
+MAX_MESSAGE_CHARS = 2000
+MAX_CONTEXT_CHARS = 1000
+
+# getUpdates expects a JSON-serialized list here, not a repeated query parameter
+_ALLOWED_UPDATES = json.dumps(["callback_query"])
+
+# Inline button labels for permission prompts
+_ALLOW_LABEL = "\u2705 Allow"
+_DENY_LABEL = "\u274C Deny"
+
+# Legacy Markdown specials, each escaped with a backslash in a single pass
+_MARKDOWN_ESCAPES = str.maketrans({char: "\\" + char for char in "*_`["})
+
+
+def _permission_keyboard(request_id: str) -> dict:
+    """Build the Allow/Deny inline keyboard for a permission request."""
+    return {
+        "inline_keyboard": [
+            [
+                {"text": _ALLOW_LABEL, "callback_data": f"perm_allow:{request_id}"},
+                {"text": _DENY_LABEL, "callback_data": f"perm_deny:{request_id}"},
+            ],
+        ],
+    }
+
 
 class TelegramNotifier:
     """Send notifications to Telegram with inline keyboards."""
@@ -19,23 +52,49 @@ class TelegramNotifier:
         chat_id: str,
         on_open_terminal: Callable | None = None,
         server_url: str = "http://127.0.0.1:8765",
+        on_permission_decision: Callable[[str, str], bool] | None = None,
+        executor: Executor | None = None,
     ):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self._on_open_terminal = on_open_terminal
+        # In-process resolver for permission decisions (request_id, decision) -> found;
+        # without one, decisions are POSTed to the server's /permission/respond
+        self._on_permission_decision = on_permission_decision
         self._server_url = server_url
-        self._bot = None
-        self._app = None
+        self._api_url = f"https://api.telegram.org/bot{bot_token}"
         self._polling_thread: threading.Thread | None = None
         self._polling = False
+        # Run callbacks on the caller's executor when given, rather than
+        # keeping a second set of worker threads around just for button taps
+        self._owns_callback_pool = executor is None
+        self._callback_pool = executor or ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="heyclaude-telegram"
+        )
+
+        # Keep-alive session shared by sends, polling and callbacks, so none of
+        # them pay a fresh TCP/TLS handshake per request
+        self._session = requests.Session()
+        self._session.headers["Connection"] = "keep-alive"
+        # Only connection failures are retried: the request never reached
+        # Telegram then, so resending can't duplicate a message. Read timeouts
+        # and error statuses are not, as Telegram may already have acted on the
+        # POST, and a Retry-After wait would tie up a dispatch worker.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3),
+        )
+        self._session.mount("https://", adapter)
 
-    async def _get_bot(self):
-        """Get or create the bot instance."""
-        # Always create a fresh bot to avoid event loop issues
-        from telegram import Bot
-        return Bot(token=self.bot_token)
+        # getUpdates gets its own single-connection session: the long poll holds
+        # its connection for up to POLL_TIMEOUT seconds and must never make sends
+        # or callback replies wait for a free connection. No retries either, the
+        # poll loop already just goes around again.
+        self._poll_session = requests.Session()
+        self._poll_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
-    async def send_notification(
+    def send_notification_sync(
         self,
         project: str,
         cwd: str,
@@ -60,11 +119,7 @@ class TelegramNotifier:
         Returns:
             True if message was sent successfully
         """
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-
         try:
-            bot = await self._get_bot()
-
             # Different formatting based on notification type
             if notification_type == "permission_prompt":
                 title = f"\U0001F6A8 *Permission Required - {self._escape_markdown(project)}*"
@@ -75,40 +130,31 @@ class TelegramNotifier:
 
             # Add the notification message (question)
             if message:
+                if len(message) > MAX_MESSAGE_CHARS:
+                    message = message[:MAX_MESSAGE_CHARS] + "..."
                 text_parts.append(f"\n\U0001F4AC {self._escape_markdown(message)}")
 
             # Add context (questions with options)
             if include_context and context:
-                truncated = context[:1000] + "..." if len(context) > 1000 else context
+                truncated = context[:MAX_CONTEXT_CHARS] + "..." if len(context) > MAX_CONTEXT_CHARS else context
                 truncated = self._escape_markdown(truncated)
                 text_parts.append(f"\n```\n{truncated}\n```")
 
-            text = "\n".join(text_parts)
+            payload = {
+                "chat_id": self.chat_id,
+                "text": "\n".join(text_parts),
+                "parse_mode": "Markdown",
+            }
 
-            # Build keyboard based on notification type
+            # Add Allow/Deny buttons for permission requests
             if notification_type == "permission_prompt" and request_id:
-                keyboard = [
-                    [
-                        InlineKeyboardButton(
-                            "\u2705 Allow",
-                            callback_data=f"perm_allow:{request_id}",
-                        ),
-                        InlineKeyboardButton(
-                            "\u274C Deny",
-                            callback_data=f"perm_deny:{request_id}",
-                        ),
-                    ],
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-            else:
-                reply_markup = None
+                payload["reply_markup"] = _permission_keyboard(request_id)
 
-            await bot.send_message(
-                chat_id=self.chat_id,
-                text=text,
-                parse_mode="Markdown",
-                reply_markup=reply_markup,
-            )
+            response = self._session.post(f"{self._api_url}/sendMessage", json=payload, timeout=10)
+            data = response.json()
+            if not data.get("ok"):
+                logger.error(f"Failed to send Telegram notification: {data.get('description')}")
+                return False
 
             logger.info(f"Telegram notification sent for project: {project} (type: {notification_type})")
             return True
@@ -119,41 +165,7 @@ class TelegramNotifier:
 
     def _escape_markdown(self, text: str) -> str:
         """Escape special Markdown characters."""
-        for char in ['*', '_', '`', '[']:
-            text = text.replace(char, '\\' + char)
-        return text
-
-    def send_notification_sync(
-        self,
-        project: str,
-        cwd: str,
-        message: str = "",
-        context: str | None = None,
-        include_context: bool = True,
-        notification_type: str = "",
-        request_id: str | None = None,
-    ) -> bool:
-        """Synchronous wrapper for send_notification."""
-        try:
-            # Create a fresh event loop for each call to avoid closed loop issues
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(
-                    self.send_notification(
-                        project, cwd, message, context, include_context, notification_type, request_id
-                    )
-                )
-            finally:
-                # Clean up pending tasks before closing
-                pending = asyncio.all_tasks(loop)
-                for task in pending:
-                    task.cancel()
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                loop.close()
-        except Exception as e:
-            logger.error(f"Error in sync notification: {e}")
-            return False
+        return text.translate(_MARKDOWN_ESCAPES)
 
     def start_polling(self):
         """Start polling for button callback updates in a background thread."""
@@ -168,6 +180,8 @@ class TelegramNotifier:
     def stop_polling(self):
         """Stop polling for updates."""
         self._polling = False
+        if self._owns_callback_pool:
+            self._callback_pool.shutdown(wait=False)
         if self._polling_thread:
             self._polling_thread.join(timeout=2)
         logger.info("Telegram polling stopped")
@@ -179,9 +193,13 @@ class TelegramNotifier:
         offset = 0
         while self._polling:
             try:
-                url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
-                params = {"offset": offset, "timeout": 30, "allowed_updates": ["callback_query"]}
-                response = requests.get(url, params=params, timeout=35)
+                url = f"{self._api_url}/getUpdates"
+                params = {
+                    "offset": offset,
+                    "timeout": POLL_TIMEOUT,
+                    "allowed_updates": _ALLOWED_UPDATES,
+                }
+                response = self._poll_session.get(url, params=params, timeout=POLL_TIMEOUT + 10)
                 data = response.json()
 
                 if data.get("ok"):
@@ -189,7 +207,8 @@ class TelegramNotifier:
                         offset = update["update_id"] + 1
                         callback = update.get("callback_query")
                         if callback:
-                            self._handle_callback(callback)
+                            # Handle off the polling thread so the next getUpdates goes out now
+                            self._callback_pool.submit(self._handle_callback, callback)
             except requests.exceptions.Timeout:
                 continue
             except Exception as e:
@@ -212,30 +231,37 @@ class TelegramNotifier:
         else:
             # Answer unknown callbacks
             try:
-                url = f"https://api.telegram.org/bot{self.bot_token}/answerCallbackQuery"
-                requests.post(url, json={"callback_query_id": callback_id}, timeout=5)
+                url = f"{self._api_url}/answerCallbackQuery"
+                self._session.post(url, json={"callback_query_id": callback_id}, timeout=5)
             except Exception as e:
                 logger.error(f"Error answering callback: {e}")
 
     def _respond_permission(self, request_id: str, decision: str, message: dict, callback_id: str):
-        """Send permission response to HeyClaude server."""
+        """Deliver a permission decision to the waiting hook request."""
         decision_text = "\u2705 Allowed" if decision == "allow" else "\u274C Denied"
 
         try:
-            url = f"{self._server_url}/permission/respond"
-            response = requests.post(
-                url,
-                json={"request_id": request_id, "decision": decision},
-                timeout=5,
-            )
-            if response.ok:
+            if self._on_permission_decision is not None:
+                responded = self._on_permission_decision(request_id, decision)
+            else:
+                url = f"{self._server_url}/permission/respond"
+                responded = self._session.post(
+                    url,
+                    json={"request_id": request_id, "decision": decision},
+                    timeout=5,
+                ).ok
+
+            if responded:
                 logger.info(f"Permission {request_id} responded: {decision}")
-                # Answer the callback with the decision as a toast notification
-                self._answer_callback(callback_id, decision_text)
-                # Remove the buttons from the message
-                self._remove_buttons(message)
+                # Show the decision as a toast while the message is edited alongside
+                try:
+                    self._callback_pool.submit(self._answer_callback, callback_id, decision_text)
+                except RuntimeError:
+                    # Pool already shut down by stop_polling()
+                    self._answer_callback(callback_id, decision_text)
+                self._close_prompt(message, decision_text)
             else:
-                logger.error(f"Failed to respond to permission: {response.text}")
+                logger.error(f"Failed to respond to permission {request_id}: expired or not found")
                 self._answer_callback(callback_id, "Error: Request expired or not found")
         except Exception as e:
             logger.error(f"Error responding to permission: {e}")
@@ -244,8 +270,8 @@ class TelegramNotifier:
     def _answer_callback(self, callback_id: str, text: str):
         """Answer a callback query."""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/answerCallbackQuery"
-            requests.post(
+            url = f"{self._api_url}/answerCallbackQuery"
+            self._session.post(
                 url,
                 json={"callback_query_id": callback_id, "text": text, "show_alert": False},
                 timeout=5,
@@ -253,60 +279,92 @@ class TelegramNotifier:
         except Exception as e:
             logger.error(f"Error answering callback: {e}")
 
-    def _remove_buttons(self, message: dict):
-        """Remove inline keyboard buttons from a message."""
+    def _close_prompt(self, message: dict, decision_text: str):
+        """Append the decision to a permission message and remove its buttons in one edit."""
         chat_id = message.get("chat", {}).get("id")
         message_id = message.get("message_id")
 
         if not chat_id or not message_id:
             return
 
+        payload = {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "reply_markup": {"inline_keyboard": []},
+        }
+        text = message.get("text")
+        if text:
+            # Resend the original text with its entities so the formatting survives;
+            # appending at the end leaves every entity offset valid
+            method = "editMessageText"
+            payload["text"] = f"{text}\n\n{decision_text}"
+            if message.get("entities"):
+                payload["entities"] = message["entities"]
+        else:
+            # No text to edit (e.g. an inaccessible message); just drop the buttons
+            method = "editMessageReplyMarkup"
+
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/editMessageReplyMarkup"
-            requests.post(
-                url,
-                json={
-                    "chat_id": chat_id,
-                    "message_id": message_id,
-                    "reply_markup": {"inline_keyboard": []},
-                },
-                timeout=5,
-            )
+            self._session.post(f"{self._api_url}/{method}", json=payload, timeout=5)
         except Exception as e:
-            logger.error(f"Error removing buttons: {e}")
+            logger.error(f"Error closing permission prompt: {e}")
 
 
-async def test_telegram_connection(bot_token: str, chat_id: str) -> tuple[bool, str]:
+def test_telegram_connection_sync(bot_token: str, chat_id: str) -> tuple[bool, str]:
     """
     Test the Telegram bot connection.
 
     Returns:
         Tuple of (success, message)
     """
+    api_url = f"https://api.telegram.org/bot{bot_token}"
     try:
-        from telegram import Bot
+        with requests.Session() as session:
+            me = session.get(f"{api_url}/getMe", timeout=10).json()
+            if not me.get("ok"):
+                return False, me.get("description", "Invalid bot token")
 
-        bot = Bot(token=bot_token)
-        me = await bot.get_me()
-
-        await bot.send_message(
-            chat_id=chat_id,
-            text="\u2705 *HeyClaude Connected*\nTelegram notifications are working!",
-            parse_mode="Markdown",
-        )
+            sent = session.post(
+                f"{api_url}/sendMessage",
+                json={
+                    "chat_id": chat_id,
+                    "text": "\u2705 *HeyClaude Connected*\nTelegram notifications are working!",
+                    "parse_mode": "Markdown",
+                },
+                timeout=10,
+            ).json()
+            if not sent.get("ok"):
+                return False, sent.get("description", "Failed to send test message")
 
-        return True, f"Connected as @{me.username}"
+        return True, f"Connected as @{me['result'].get('username')}"
     except Exception as e:
         return False, str(e)
 
 
-def test_telegram_connection_sync(bot_token: str, chat_id: str) -> tuple[bool, str]:
-    """Synchronous wrapper for test_telegram_connection."""
+def fetch_chat_id_sync(bot_token: str) -> tuple[str | None, str]:
+    """
+    Find the chat ID of the most recent message sent to the bot.
+
+    Returns:
+        Tuple of (chat_id, message); chat_id is None on failure and message
+        says why
+    """
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(test_telegram_connection(bot_token, chat_id))
+        data = requests.get(f"https://api.telegram.org/bot{bot_token}/getUpdates", timeout=10).json()
+        if not data.get("ok"):
+            return None, f"API error: {data.get('description', 'Unknown error')}"
+
+        results = data.get("result", [])
+        if not results:
+            return None, "No messages found.\n\n1. Send a message to your bot first\n2. Then click 'Get Chat ID' again"
+
+        # Get chat ID from the most recent message
+        for update in reversed(results):
+            msg = update.get("message") or update.get("edited_message")
+            if msg and msg.get("chat"):
+                chat_id = str(msg["chat"]["id"])
+                return chat_id, f"Chat ID found: {chat_id}"
+
+        return None, "No chat found in recent messages"
     except Exception as e:
-        return False, str(e)
-    finally:
-        loop.close()
+        return None, f"Error: {e}"
@@ -2,7 +2,9 @@
 
 import logging
 import subprocess
+import time
 
+import AppKit
 import Quartz
 
 logger = logging.getLogger(__name__)
@@ -12,11 +14,19 @@ def get_system_idle_time() -> float:
     """
     Get the system idle time in seconds.
 
-    Uses macOS IOKit to get the HID idle time.
+    Asks the HID event source in-process via Quartz, falling back to
+    parsing `ioreg` output for the IOKit HID idle time.
 
     Returns:
         Idle time in seconds, or 0 if detection fails.
     """
+    try:
+        return Quartz.CGEventSourceSecondsSinceLastEventType(
+            Quartz.kCGEventSourceStateHIDSystemState, Quartz.kCGAnyInputEventType
+        )
+    except Exception as e:
+        logger.debug(f"Quartz idle time unavailable, using ioreg: {e}")
+
     try:
         result = subprocess.run(
             ["ioreg", "-c", "IOHIDSystem", "-d", "4"],
@@ -64,39 +74,53 @@ TERMINAL_APPS = {
 }
 
 
+# (lowercase substring of the frontmost app's name, terminal name), checked in order
+_TERMINAL_MATCH = (
+    ("iterm", "iTerm"),
+    ("terminal", "Terminal"),
+    ("warp", "Warp"),
+    ("alacritty", "Alacritty"),
+    ("kitty", "Kitty"),
+)
+
+# How long a detect_terminal() result is reused; the frontmost app rarely
+# changes between notifications that arrive back to back
+DETECT_TTL = 2.0
+
+# (monotonic time, result) of the last detect_terminal() call
+_detect_cache: tuple[float, str] | None = None
+
+
 def detect_terminal() -> str:
     """
     Detect the currently running terminal application.
 
+    Results are reused for DETECT_TTL seconds.
+
     Returns:
         Terminal app name (iTerm, Terminal, Warp, etc.) or "iTerm" as default
     """
-    script = """
-    tell application "System Events"
-        set frontApp to name of first application process whose frontmost is true
-        return frontApp
-    end tell
-    """
+    global _detect_cache
+
+    now = time.monotonic()
+    if _detect_cache is not None and now - _detect_cache[0] < DETECT_TTL:
+        return _detect_cache[1]
 
+    terminal_app = _detect_terminal()
+    _detect_cache = (now, terminal_app)
+    return terminal_app
+
+
+def _detect_terminal() -> str:
+    """Map the frontmost application to a terminal name."""
     try:
-        result = subprocess.run(
-            ["osascript", "-e", script],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        front_app = result.stdout.strip()
-
-        if "iTerm" in front_app:
-            return "iTerm"
-        elif "Terminal" in front_app:
-            return "Terminal"
-        elif "Warp" in front_app:
-            return "Warp"
-        elif "Alacritty" in front_app:
-            return "Alacritty"
-        elif "kitty" in front_app.lower():
-            return "Kitty"
+        front = AppKit.NSWorkspace.sharedWorkspace().frontmostApplication()
+        front_app = (front.localizedName() or "") if front is not None else ""
+
+        front_app = front_app.lower()
+        for needle, name in _TERMINAL_MATCH:
+            if needle in front_app:
+                return name
     except Exception as e:
         logger.debug(f"Could not detect terminal: {e}")
 
@@ -122,6 +146,23 @@ def activate_terminal(terminal_app: str = "iTerm"):
 
     bundle_id = TERMINAL_APPS.get(terminal_app, TERMINAL_APPS["iTerm"])
 
+    # Activate in-process; only fall back to osascript if AppKit can't do it
+    try:
+        running = AppKit.NSRunningApplication.runningApplicationsWithBundleIdentifier_(bundle_id)
+        if running:
+            activated = running[0].activateWithOptions_(
+                AppKit.NSApplicationActivateIgnoringOtherApps
+            )
+        else:
+            activated = AppKit.NSWorkspace.sharedWorkspace().launchAppWithBundleIdentifier_options_additionalEventParamDescriptor_launchIdentifier_(
+                bundle_id, AppKit.NSWorkspaceLaunchDefault, None, None
+            )[0]
+        if activated:
+            logger.debug(f"Activated terminal: {terminal_app}")
+            return
+    except Exception as e:
+        logger.debug(f"AppKit activation failed, using osascript: {e}")
+
     script = f"""
     tell application id "{bundle_id}"
         activate
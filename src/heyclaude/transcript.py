@@ -2,16 +2,40 @@
 
 import json
 import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+try:
+    # orjson parses bytes directly and is several times faster on JSONL
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
 
+# Chunk size for reading the transcript backwards from the end
+CHUNK_BYTES = 64 * 1024
+
+# Stop looking for an AskUserQuestion after this many assistant entries
+MAX_ASSISTANT_ENTRIES = 50
+
+# Recent results, one per transcript: path -> ((mtime_ns, size, max_lines), result).
+# Several Claude sessions can be notifying at once, so keep a few.
+CACHE_SIZE = 8
+_parse_cache: OrderedDict[str, tuple[tuple[int, int, int], str | None]] = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
 def parse_transcript(transcript_path: str, max_lines: int = 20) -> str | None:
     """
     Parse a Claude Code JSONL transcript and extract the last question/context.
 
-    Looks for AskUserQuestion tool calls first, then falls back to last assistant message.
+    The transcript is read backwards from the end, so only its tail is parsed.
+    Looks for AskUserQuestion tool calls first, then falls back to last
+    assistant message.
 
     Args:
         transcript_path: Path to the JSONL transcript file
@@ -21,52 +45,23 @@ def parse_transcript(transcript_path: str, max_lines: int = 20) -> str | None:
         The question with options, or last assistant message text, or None
     """
     path = Path(transcript_path)
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         logger.warning(f"Transcript not found: {transcript_path}")
         return None
 
-    last_question = None
-    last_assistant_message = None
+    # Repeat notifications for an unchanged transcript reuse the cached result;
+    # transcripts are append-only, so any write changes the size or mtime
+    fingerprint = (st.st_mtime_ns, st.st_size, max_lines)
+    with _parse_cache_lock:
+        cached = _parse_cache.get(transcript_path)
+        if cached is not None and cached[0] == fingerprint:
+            _parse_cache.move_to_end(transcript_path)
+            return cached[1]
 
     try:
-        with open(path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                if entry.get("type") == "assistant":
-                    message = entry.get("message", {})
-                    content = message.get("content", [])
-
-                    text_parts = []
-                    for block in content:
-                        if isinstance(block, dict):
-                            block_type = block.get("type", "")
-
-                            # Check for tool_use blocks (AskUserQuestion)
-                            if block_type == "tool_use":
-                                tool_name = block.get("name", "")
-                                if tool_name == "AskUserQuestion":
-                                    question_text = _format_ask_user_question(block.get("input", {}))
-                                    if question_text:
-                                        last_question = question_text
-
-                            # Regular text blocks
-                            elif block_type == "text":
-                                text_parts.append(block.get("text", ""))
-
-                        elif isinstance(block, str):
-                            text_parts.append(block)
-
-                    if text_parts:
-                        last_assistant_message = "\n".join(text_parts)
-
+        last_question, last_assistant_message = _scan_entries(_iter_lines_reverse(path))
     except Exception as e:
         logger.error(f"Error parsing transcript: {e}")
         return None
@@ -74,15 +69,123 @@ def parse_transcript(transcript_path: str, max_lines: int = 20) -> str | None:
     # Prefer question with options over plain text
     result = last_question or last_assistant_message
 
-    if result:
-        # max_lines >= 100 means "All" - no truncation
-        if max_lines < 100:
-            lines = result.split("\n")
-            if len(lines) > max_lines:
-                return "\n".join(lines[:max_lines]) + "\n..."
-        return result
+    if result and max_lines < 100:
+        # max_lines >= 100 means "All" - no truncation. Split at most max_lines
+        # times; anything past that stays in one unsplit remainder.
+        lines = result.split("\n", max_lines)
+        if len(lines) > max_lines:
+            result = "\n".join(lines[:max_lines]) + "\n..."
+
+    result = result or None
+    with _parse_cache_lock:
+        _parse_cache[transcript_path] = (fingerprint, result)
+        _parse_cache.move_to_end(transcript_path)
+        if len(_parse_cache) > CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return result
+
+
+def _iter_lines_reverse(path: Path, chunk_size: int = CHUNK_BYTES):
+    """Yield the lines of a file from last to first, reading it in chunks from the end."""
+    # A chunk-sized buffer: reads are large and follow a seek anyway, and a
+    # BufferedReader keeps reading until it has the full size (or hits EOF)
+    with open(path, "rb", buffering=chunk_size) as f:
+        pos = f.seek(0, os.SEEK_END)
+        # Pieces of the line that runs on past the current chunk, last piece
+        # first. They're only joined once the line's start is found, so a line
+        # spanning many chunks is still copied a bounded number of times.
+        partial = []
+        while pos > 0:
+            size = min(chunk_size, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            if len(chunk) != size:
+                raise OSError(f"{path} shrank while being read")
+            if b"\n" not in chunk:
+                partial.append(chunk)
+                continue
+            lines = chunk.split(b"\n")
+            if partial:
+                partial.append(lines[-1])
+                lines[-1] = b"".join(reversed(partial))
+            # The first piece may continue in the previous chunk
+            partial = [lines[0]]
+            yield from reversed(lines[1:])
+        yield b"".join(reversed(partial))
+
+
+def _scan_entries(lines) -> tuple[str | None, str | None]:
+    """
+    Scan JSONL lines, newest first, for the last AskUserQuestion and last assistant message.
+
+    Stops as soon as a question is found, or after MAX_ASSISTANT_ENTRIES
+    assistant entries.
+
+    Returns:
+        Tuple of (last_question, last_assistant_message)
+    """
+    last_question = None
+    last_assistant_message = None
+    assistant_entries = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            entry = _json_loads(line)
+        except json.JSONDecodeError:
+            continue
+
+        if entry.get("type") != "assistant":
+            continue
+
+        # Only the newest text is used, so older entries are scanned for questions only
+        question, text = _read_assistant_entry(entry, want_text=last_assistant_message is None)
+        if last_assistant_message is None and text:
+            last_assistant_message = text
+        if question:
+            last_question = question
+            break
+
+        assistant_entries += 1
+        if assistant_entries >= MAX_ASSISTANT_ENTRIES:
+            break
+
+    return last_question, last_assistant_message
+
+
+def _read_assistant_entry(entry: dict, want_text: bool = True) -> tuple[str | None, str | None]:
+    """
+    Extract the last AskUserQuestion and the joined text of one assistant entry.
+
+    With want_text=False the text blocks are skipped and text is always None.
+
+    Returns:
+        Tuple of (question, text)
+    """
+    question = None
+    text_parts = []
+
+    for block in entry.get("message", {}).get("content", []):
+        if isinstance(block, dict):
+            block_type = block.get("type", "")
+
+            # Check for tool_use blocks (AskUserQuestion)
+            if block_type == "tool_use":
+                if block.get("name", "") == "AskUserQuestion":
+                    question = _format_ask_user_question(block.get("input", {})) or question
+
+            # Regular text blocks
+            elif block_type == "text" and want_text:
+                text_parts.append(block.get("text", ""))
+
+        elif isinstance(block, str) and want_text:
+            text_parts.append(block)
 
-    return None
+    return question, "\n".join(text_parts) if text_parts else None
 
 
 def _format_ask_user_question(input_data: dict) -> str | None:
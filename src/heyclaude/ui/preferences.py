@@ -1,53 +1,140 @@
 """Preferences window using PyObjC."""
 
 import logging
-import threading
+import subprocess
+import time
 
 import objc
 from AppKit import (
     NSAlert,
-    NSAlertFirstButtonReturn,
     NSApp,
+    NSApplicationActivateIgnoringOtherApps,
+    NSApplicationActivationPolicyRegular,
     NSBackingStoreBuffered,
     NSBezelStyleRounded,
     NSButton,
-    NSComboBox,
+    NSColor,
     NSFont,
-    NSLayoutAttributeBottom,
-    NSLayoutAttributeCenterY,
-    NSLayoutAttributeLeading,
-    NSLayoutAttributeTop,
-    NSLayoutAttributeTrailing,
-    NSLayoutAttributeWidth,
-    NSLayoutConstraint,
-    NSLayoutRelationEqual,
-    NSMakeRect,
+    NSMenu,
+    NSMenuItem,
     NSObject,
     NSOffState,
     NSOnState,
     NSPopUpButton,
+    NSRunningApplication,
     NSSecureTextField,
     NSSlider,
-    NSStackView,
     NSSwitchButton,
     NSTabView,
     NSTabViewItem,
     NSTextField,
-    NSTextFieldCell,
-    NSUserInterfaceLayoutOrientationVertical,
     NSView,
     NSWindow,
     NSWindowStyleMaskClosable,
     NSWindowStyleMaskMiniaturizable,
     NSWindowStyleMaskTitled,
 )
-from Foundation import NSMakeRect
+from Foundation import NSOperationQueue, NSTimer
 
-from ..config import get_config
-from ..telegram_bot import test_telegram_connection_sync
+from ..config import get_log_path
+from ..hooks import install_hook, is_hook_installed
+from ..telegram_bot import fetch_chat_id_sync, test_telegram_connection_sync
 
 logger = logging.getLogger(__name__)
 
+# Seconds a hook status check stays fresh; older results are still shown
+# while a new check runs in the background
+HOOK_STATUS_TTL = 5.0
+
+# Seconds a slider must be still before its value is saved
+SLIDER_SAVE_DELAY = 0.2
+
+# Choices offered by the sound and terminal popups
+SOUNDS = ["Ping", "Basso", "Blow", "Bottle", "Frog", "Funk", "Glass", "Hero", "Pop", "Submarine"]
+TERMINALS = ["iTerm", "Terminal", "Warp", "Alacritty", "Kitty", "auto"]
+
+# Text colours for hints and notes, looked up once. System label colours are
+# dynamic, so these still follow light/dark mode.
+HINT_COLOR = NSColor.secondaryLabelColor()
+NOTE_COLOR = NSColor.tertiaryLabelColor()
+
+# Fonts for small hint text and section headers
+HINT_FONT = NSFont.systemFontOfSize_(11)
+HEADER_FONT = NSFont.boldSystemFontOfSize_(13)
+
+# Frames below are plain ((x, y), (width, height)) tuples, which PyObjC accepts
+# anywhere an NSRect is expected without a call through NSMakeRect
+
+# Static row labels of each tab: (text, x, y, width, height)
+LABELS = {
+    "general": (
+        ("Launch at Login:", 20, 360, 150, 20),
+        ("Server Port:", 20, 320, 150, 20),
+        ("Hook Status:", 20, 260, 150, 20),
+    ),
+    "macos": (
+        ("Enable Notifications:", 20, 360, 150, 20),
+        ("Play Sound:", 20, 320, 150, 20),
+        ("Sound:", 20, 280, 150, 20),
+        ("Terminal App:", 20, 240, 150, 20),
+    ),
+    "telegram": (
+        ("Enable Telegram:", 20, 360, 150, 20),
+        ("Bot Token:", 20, 320, 150, 20),
+        ("Chat ID:", 20, 280, 150, 20),
+        ("Include Context:", 20, 190, 150, 20),
+        ("Context Lines:", 20, 150, 150, 20),
+        ("Idle time for Telegram:", 20, 100, 150, 20),
+        ("Send when screen locked:", 20, 40, 170, 20),
+    ),
+    "advanced": (
+        ("Idle notifications:", 20, 330, 150, 20),
+        ("Permission notifications:", 20, 300, 150, 20),
+        ("Debug Logging:", 20, 225, 150, 20),
+    ),
+}
+
+# Edit menu entries as (title, action, key equivalent); None is a separator
+EDIT_MENU_ITEMS = (
+    ("Cut", "cut:", "x"),
+    ("Copy", "copy:", "c"),
+    ("Paste", "paste:", "v"),
+    None,
+    ("Select All", "selectAll:", "a"),
+)
+
+# (identifier, label) of each preferences tab, in display order
+TABS = (
+    ("general", "General"),
+    ("macos", "macOS"),
+    ("telegram", "Telegram"),
+    ("advanced", "Advanced"),
+)
+
+# Controller ivars holding controls, cleared when the window closes
+CONTROLS = (
+    "launch_checkbox",
+    "port_field",
+    "hook_status",
+    "macos_enabled",
+    "sound_enabled_checkbox",
+    "sound_popup",
+    "terminal_popup",
+    "telegram_enabled",
+    "token_field",
+    "chat_field",
+    "get_chat_btn",
+    "context_checkbox",
+    "lines_slider",
+    "lines_value",
+    "idle_time_slider",
+    "idle_time_value",
+    "screen_lock_checkbox",
+    "idle_notif_checkbox",
+    "perm_notif_checkbox",
+    "debug_checkbox",
+)
+
 
 class PreferencesWindowController(NSObject):
     """Controller for the preferences window."""
@@ -55,7 +142,31 @@ class PreferencesWindowController(NSObject):
     window = objc.ivar()
     config = objc.ivar()
     on_config_changed = objc.ivar()
-    _menu_initialized = objc.ivar()
+    _menubar = objc.ivar()
+    _flush_timer = objc.ivar()
+    _tab_view = objc.ivar()
+
+    # Controls (see CONTROLS), filled in as their tab is built
+    launch_checkbox = objc.ivar()
+    port_field = objc.ivar()
+    hook_status = objc.ivar()
+    macos_enabled = objc.ivar()
+    sound_enabled_checkbox = objc.ivar()
+    sound_popup = objc.ivar()
+    terminal_popup = objc.ivar()
+    telegram_enabled = objc.ivar()
+    token_field = objc.ivar()
+    chat_field = objc.ivar()
+    get_chat_btn = objc.ivar()
+    context_checkbox = objc.ivar()
+    lines_slider = objc.ivar()
+    lines_value = objc.ivar()
+    idle_time_slider = objc.ivar()
+    idle_time_value = objc.ivar()
+    screen_lock_checkbox = objc.ivar()
+    idle_notif_checkbox = objc.ivar()
+    perm_notif_checkbox = objc.ivar()
+    debug_checkbox = objc.ivar()
 
     def initWithConfig_(self, config):
         self = objc.super(PreferencesWindowController, self).init()
@@ -64,9 +175,17 @@ class PreferencesWindowController(NSObject):
 
         self.config = config
         self.on_config_changed = None
+        # Last known hook install state and when (time.monotonic()) it was checked
+        self._hook_installed = None
+        self._hook_checked_at = 0.0
+        # Slider settings waiting for flushConfig_
+        self._pending_changes = {}
+        # Background queue for Telegram API calls and hook checks
+        self._network_queue = NSOperationQueue.alloc().init()
         self._create_window()
         return self
 
+    @objc.python_method
     def _create_window(self):
         """Create the preferences window."""
         style = (
@@ -76,7 +195,7 @@ class PreferencesWindowController(NSObject):
         )
 
         self.window = NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
-            NSMakeRect(0, 0, 500, 480),
+            ((0, 0), (500, 480)),
             style,
             NSBackingStoreBuffered,
             False,
@@ -84,23 +203,64 @@ class PreferencesWindowController(NSObject):
         self.window.setTitle_("HeyClaude Preferences")
         self.window.setReleasedWhenClosed_(False)  # Prevent crash on reopen
         self.window.center()
+        self.window.setDelegate_(self)
+
+        self._create_tabs()
+
+    @objc.python_method
+    def _create_tabs(self):
+        """Create the tab view in the window's content view."""
+        tab_view = NSTabView.alloc().initWithFrame_(((20, 20), (460, 440)))
+
+        # Tabs get their content the first time they're selected; only the
+        # first one is built up front
+        self._tab_builders = {
+            "general": self._create_general_tab,
+            "macos": self._create_macos_tab,
+            "telegram": self._create_telegram_tab,
+            "advanced": self._create_advanced_tab,
+        }
+        self._built_tabs = set()
+        for identifier, label in TABS:
+            tab = NSTabViewItem.alloc().initWithIdentifier_(identifier)
+            tab.setLabel_(label)
+            tab_view.addTabViewItem_(tab)
+        self._build_tab(tab_view.tabViewItemAtIndex_(0))
+        tab_view.setDelegate_(self)
+
+        # Swap in a complete, layer-backed root in one step; subviews inherit
+        # the layer backing
+        root = NSView.alloc().initWithFrame_(((0, 0), (500, 480)))
+        root.setWantsLayer_(True)
+        root.addSubview_(tab_view)
+        self.window.setContentView_(root)
+        self._tab_view = tab_view
+
+    def windowWillClose_(self, notification):
+        """NSWindowDelegate: release the tabs and their controls while the window is closed."""
+        # Save slider values still waiting on the debounce timer
+        if self._flush_timer is not None:
+            self._flush_timer.fire()
+
+        self.window.setContentView_(NSView.alloc().initWithFrame_(((0, 0), (500, 480))))
+        self._tab_view = None
+        for name in CONTROLS:
+            setattr(self, name, None)
+
+    def tabView_willSelectTabViewItem_(self, tab_view, tab):
+        """NSTabViewDelegate: build a tab's content on its first selection."""
+        self._build_tab(tab)
+
+    @objc.python_method
+    def _build_tab(self, tab):
+        """Build and attach a tab's view, unless that already happened."""
+        identifier = str(tab.identifier())
+        if identifier in self._built_tabs:
+            return
+        self._built_tabs.add(identifier)
+        tab.setView_(self._tab_builders[identifier]())
 
-        tab_view = NSTabView.alloc().initWithFrame_(NSMakeRect(20, 20, 460, 440))
-
-        general_tab = self._create_general_tab()
-        tab_view.addTabViewItem_(general_tab)
-
-        macos_tab = self._create_macos_tab()
-        tab_view.addTabViewItem_(macos_tab)
-
-        telegram_tab = self._create_telegram_tab()
-        tab_view.addTabViewItem_(telegram_tab)
-
-        advanced_tab = self._create_advanced_tab()
-        tab_view.addTabViewItem_(advanced_tab)
-
-        self.window.contentView().addSubview_(tab_view)
-
+    @objc.python_method
     def _create_label(self, text: str, frame) -> NSTextField:
         """Create a label text field."""
         label = NSTextField.alloc().initWithFrame_(frame)
@@ -111,391 +271,354 @@ class PreferencesWindowController(NSObject):
         label.setSelectable_(False)
         return label
 
-    def _create_general_tab(self) -> NSTabViewItem:
-        """Create the General tab."""
-        tab = NSTabViewItem.alloc().initWithIdentifier_("general")
-        tab.setLabel_("General")
+    @objc.python_method
+    def _create_labels(self, labels) -> list:
+        """Create label text fields from (text, x, y, width, height) tuples."""
+        return [self._create_label(text, ((x, y), (w, h))) for text, x, y, w, h in labels]
+
+    @objc.python_method
+    def _configure_button(
+        self,
+        button: NSButton,
+        *,
+        button_type=None,
+        title: str | None = None,
+        state: bool | None = None,
+        bezel_style=None,
+        action: str | None = None,
+    ) -> NSButton:
+        """Apply the given settings to a button, targeting self for its action."""
+        if button_type is not None:
+            button.setButtonType_(button_type)
+        if title is not None:
+            button.setTitle_(title)
+        if state is not None:
+            button.setState_(NSOnState if state else NSOffState)
+        if bezel_style is not None:
+            button.setBezelStyle_(bezel_style)
+        if action is not None:
+            button.setTarget_(self)
+            button.setAction_(action)
+        return button
+
+    @objc.python_method
+    def _make_switch(self, frame, on: bool, key: str) -> NSButton:
+        """Create a title-less checkbox bound to the boolean config key."""
+        # The title must be cleared explicitly; NSButton defaults it to "Button"
+        button = self._configure_button(
+            NSButton.alloc().initWithFrame_(frame),
+            button_type=NSSwitchButton,
+            title="",
+            state=on,
+            action="controlChanged:",
+        )
+        button.setIdentifier_(key)
+        return button
 
-        view = NSView.alloc().initWithFrame_(NSMakeRect(0, 0, 440, 400))
+    @objc.python_method
+    def _create_general_tab(self) -> NSView:
+        """Create the General tab's view."""
+        view = NSView.alloc().initWithFrame_(((0, 0), (440, 400)))
+        # Collected and attached in one setSubviews_ call at the end
+        subviews = self._create_labels(LABELS["general"])
 
         y = 360
 
-        launch_label = self._create_label("Launch at Login:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(launch_label)
-
-        self.launch_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 200, 20))
-        self.launch_checkbox.setButtonType_(NSSwitchButton)
-        self.launch_checkbox.setTitle_("")
-        self.launch_checkbox.setState_(
-            NSOnState if self.config.launch_at_login else NSOffState
+        self.launch_checkbox = self._make_switch(
+            ((180, y), (200, 20)), self.config.launch_at_login, "launch_at_login"
         )
-        self.launch_checkbox.setTarget_(self)
-        self.launch_checkbox.setAction_(objc.selector(self.launchAtLoginChanged_, signature=b"v@:@"))
-        view.addSubview_(self.launch_checkbox)
+        subviews.append(self.launch_checkbox)
 
         y -= 40
 
-        port_label = self._create_label("Server Port:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(port_label)
-
-        self.port_field = NSTextField.alloc().initWithFrame_(NSMakeRect(180, y, 100, 24))
+        self.port_field = NSTextField.alloc().initWithFrame_(((180, y), (100, 24)))
         self.port_field.setStringValue_(str(self.config.server_port))
-        view.addSubview_(self.port_field)
+        subviews.append(self.port_field)
 
         y -= 60
 
-        hook_label = self._create_label("Hook Status:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(hook_label)
-
-        self.hook_status = self._create_label("Not installed", NSMakeRect(180, y, 150, 20))
-        view.addSubview_(self.hook_status)
-
-        install_btn = NSButton.alloc().initWithFrame_(NSMakeRect(180, y - 30, 120, 30))
-        install_btn.setTitle_("Install Hook")
-        install_btn.setBezelStyle_(NSBezelStyleRounded)
-        install_btn.setTarget_(self)
-        install_btn.setAction_(objc.selector(self.installHook_, signature=b"v@:@"))
-        view.addSubview_(install_btn)
-
-        self._update_hook_status()
+        self.hook_status = self._create_label("Not installed", ((180, y), (150, 20)))
+        subviews.append(self.hook_status)
 
-        tab.setView_(view)
-        return tab
+        install_btn = self._configure_button(
+            NSButton.alloc().initWithFrame_(((180, y - 30), (120, 30))),
+            title="Install Hook",
+            bezel_style=NSBezelStyleRounded,
+            action="installHook:",
+        )
+        subviews.append(install_btn)
 
-    def _create_macos_tab(self) -> NSTabViewItem:
-        """Create the macOS Notifications tab."""
-        tab = NSTabViewItem.alloc().initWithIdentifier_("macos")
-        tab.setLabel_("macOS")
+        view.setSubviews_(subviews)
+        return view
 
-        view = NSView.alloc().initWithFrame_(NSMakeRect(0, 0, 440, 400))
+    @objc.python_method
+    def _create_macos_tab(self) -> NSView:
+        """Create the macOS Notifications tab's view."""
+        view = NSView.alloc().initWithFrame_(((0, 0), (440, 400)))
+        subviews = self._create_labels(LABELS["macos"])
 
         y = 360
 
-        enabled_label = self._create_label("Enable Notifications:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(enabled_label)
-
-        self.macos_enabled = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 200, 20))
-        self.macos_enabled.setButtonType_(NSSwitchButton)
-        self.macos_enabled.setTitle_("")
-        self.macos_enabled.setState_(
-            NSOnState if self.config.macos_enabled else NSOffState
+        self.macos_enabled = self._make_switch(
+            ((180, y), (200, 20)), self.config.macos_enabled, "notifications.macos.enabled"
         )
-        self.macos_enabled.setTarget_(self)
-        self.macos_enabled.setAction_(objc.selector(self.macosEnabledChanged_, signature=b"v@:@"))
-        view.addSubview_(self.macos_enabled)
+        subviews.append(self.macos_enabled)
 
         y -= 40
 
-        sound_enabled_label = self._create_label("Play Sound:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(sound_enabled_label)
-
-        self.sound_enabled_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 200, 20))
-        self.sound_enabled_checkbox.setButtonType_(NSSwitchButton)
-        self.sound_enabled_checkbox.setTitle_("")
-        self.sound_enabled_checkbox.setState_(
-            NSOnState if self.config.macos_sound_enabled else NSOffState
+        self.sound_enabled_checkbox = self._make_switch(
+            ((180, y), (200, 20)),
+            self.config.macos_sound_enabled,
+            "notifications.macos.sound_enabled",
         )
-        self.sound_enabled_checkbox.setTarget_(self)
-        self.sound_enabled_checkbox.setAction_(objc.selector(self.soundEnabledChanged_, signature=b"v@:@"))
-        view.addSubview_(self.sound_enabled_checkbox)
+        subviews.append(self.sound_enabled_checkbox)
 
         y -= 40
 
-        sound_label = self._create_label("Sound:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(sound_label)
-
         self.sound_popup = NSPopUpButton.alloc().initWithFrame_pullsDown_(
-            NSMakeRect(180, y, 150, 26), False
+            ((180, y), (150, 26)), False
         )
-        sounds = ["Ping", "Basso", "Blow", "Bottle", "Frog", "Funk", "Glass", "Hero", "Pop", "Submarine"]
-        for sound in sounds:
-            self.sound_popup.addItemWithTitle_(sound)
+        self.sound_popup.addItemsWithTitles_(SOUNDS)
         self.sound_popup.selectItemWithTitle_(self.config.macos_sound)
         self.sound_popup.setTarget_(self)
-        self.sound_popup.setAction_(objc.selector(self.soundChanged_, signature=b"v@:@"))
-        view.addSubview_(self.sound_popup)
+        self.sound_popup.setAction_("controlChanged:")
+        self.sound_popup.setIdentifier_("notifications.macos.sound")
+        subviews.append(self.sound_popup)
 
         y -= 40
 
-        terminal_label = self._create_label("Terminal App:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(terminal_label)
-
         self.terminal_popup = NSPopUpButton.alloc().initWithFrame_pullsDown_(
-            NSMakeRect(180, y, 150, 26), False
+            ((180, y), (150, 26)), False
         )
-        terminals = ["iTerm", "Terminal", "Warp", "Alacritty", "Kitty", "auto"]
-        for term in terminals:
-            self.terminal_popup.addItemWithTitle_(term)
+        self.terminal_popup.addItemsWithTitles_(TERMINALS)
         self.terminal_popup.selectItemWithTitle_(self.config.terminal_app)
         self.terminal_popup.setTarget_(self)
-        self.terminal_popup.setAction_(objc.selector(self.terminalChanged_, signature=b"v@:@"))
-        view.addSubview_(self.terminal_popup)
+        self.terminal_popup.setAction_("controlChanged:")
+        self.terminal_popup.setIdentifier_("notifications.macos.terminal_app")
+        subviews.append(self.terminal_popup)
 
-        tab.setView_(view)
-        return tab
+        view.setSubviews_(subviews)
+        return view
 
-    def _create_telegram_tab(self) -> NSTabViewItem:
-        """Create the Telegram tab."""
-        tab = NSTabViewItem.alloc().initWithIdentifier_("telegram")
-        tab.setLabel_("Telegram")
-
-        view = NSView.alloc().initWithFrame_(NSMakeRect(0, 0, 440, 400))
+    @objc.python_method
+    def _create_telegram_tab(self) -> NSView:
+        """Create the Telegram tab's view."""
+        view = NSView.alloc().initWithFrame_(((0, 0), (440, 400)))
+        subviews = self._create_labels(LABELS["telegram"])
 
         y = 360
 
-        enabled_label = self._create_label("Enable Telegram:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(enabled_label)
-
-        self.telegram_enabled = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 200, 20))
-        self.telegram_enabled.setButtonType_(NSSwitchButton)
-        self.telegram_enabled.setTitle_("")
-        self.telegram_enabled.setState_(
-            NSOnState if self.config.telegram_enabled else NSOffState
+        self.telegram_enabled = self._make_switch(
+            ((180, y), (200, 20)),
+            self.config.telegram_enabled,
+            "notifications.telegram.enabled",
         )
-        self.telegram_enabled.setTarget_(self)
-        self.telegram_enabled.setAction_(objc.selector(self.telegramEnabledChanged_, signature=b"v@:@"))
-        view.addSubview_(self.telegram_enabled)
+        subviews.append(self.telegram_enabled)
 
         y -= 40
 
-        token_label = self._create_label("Bot Token:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(token_label)
-
-        self.token_field = NSSecureTextField.alloc().initWithFrame_(NSMakeRect(180, y, 230, 24))
+        self.token_field = NSSecureTextField.alloc().initWithFrame_(((180, y), (230, 24)))
         self.token_field.setStringValue_(self.config.telegram_bot_token)
-        view.addSubview_(self.token_field)
+        subviews.append(self.token_field)
 
         y -= 40
 
-        chat_label = self._create_label("Chat ID:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(chat_label)
-
-        self.chat_field = NSTextField.alloc().initWithFrame_(NSMakeRect(180, y, 100, 24))
+        self.chat_field = NSTextField.alloc().initWithFrame_(((180, y), (100, 24)))
         self.chat_field.setStringValue_(self.config.telegram_chat_id)
-        view.addSubview_(self.chat_field)
+        subviews.append(self.chat_field)
 
-        self.get_chat_btn = NSButton.alloc().initWithFrame_(NSMakeRect(290, y - 3, 120, 28))
-        self.get_chat_btn.setTitle_("Get Chat ID")
-        self.get_chat_btn.setBezelStyle_(NSBezelStyleRounded)
-        self.get_chat_btn.setTarget_(self)
-        self.get_chat_btn.setAction_(objc.selector(self.getChatId_, signature=b"v@:@"))
-        view.addSubview_(self.get_chat_btn)
+        self.get_chat_btn = self._configure_button(
+            NSButton.alloc().initWithFrame_(((290, y - 3), (120, 28))),
+            title="Get Chat ID",
+            bezel_style=NSBezelStyleRounded,
+            action="getChatId:",
+        )
+        subviews.append(self.get_chat_btn)
 
         y -= 40
 
-        test_btn = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 150, 30))
-        test_btn.setTitle_("Test Connection")
-        test_btn.setBezelStyle_(NSBezelStyleRounded)
-        test_btn.setTarget_(self)
-        test_btn.setAction_(objc.selector(self.testTelegram_, signature=b"v@:@"))
-        view.addSubview_(test_btn)
+        test_btn = self._configure_button(
+            NSButton.alloc().initWithFrame_(((180, y), (150, 30))),
+            title="Test Connection",
+            bezel_style=NSBezelStyleRounded,
+            action="testTelegram:",
+        )
+        subviews.append(test_btn)
 
         y -= 50
 
-        context_label = self._create_label("Include Context:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(context_label)
-
-        self.context_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 200, 20))
-        self.context_checkbox.setButtonType_(NSSwitchButton)
-        self.context_checkbox.setTitle_("")
-        self.context_checkbox.setState_(
-            NSOnState if self.config.telegram_include_context else NSOffState
+        self.context_checkbox = self._make_switch(
+            ((180, y), (200, 20)),
+            self.config.telegram_include_context,
+            "notifications.telegram.include_context",
         )
-        self.context_checkbox.setTarget_(self)
-        self.context_checkbox.setAction_(objc.selector(self.contextChanged_, signature=b"v@:@"))
-        view.addSubview_(self.context_checkbox)
+        subviews.append(self.context_checkbox)
 
         y -= 40
 
-        lines_label = self._create_label("Context Lines:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(lines_label)
-
-        self.lines_slider = NSSlider.alloc().initWithFrame_(NSMakeRect(180, y, 150, 24))
+        self.lines_slider = NSSlider.alloc().initWithFrame_(((180, y), (150, 24)))
         self.lines_slider.setMinValue_(5)
         self.lines_slider.setMaxValue_(100)  # 100 = All
         self.lines_slider.setIntValue_(self.config.telegram_context_lines)
         self.lines_slider.setTarget_(self)
-        self.lines_slider.setAction_(objc.selector(self.linesChanged_, signature=b"v@:@"))
-        view.addSubview_(self.lines_slider)
+        self.lines_slider.setAction_("linesChanged:")
+        subviews.append(self.lines_slider)
 
         lines_val = self.config.telegram_context_lines
         lines_text = "All" if lines_val >= 100 else str(lines_val)
-        self.lines_value = self._create_label(lines_text, NSMakeRect(340, y, 40, 20))
-        view.addSubview_(self.lines_value)
+        self.lines_value = self._create_label(lines_text, ((340, y), (40, 20)))
+        subviews.append(self.lines_value)
 
         y -= 50
 
-        idle_label = self._create_label("Idle time for Telegram:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(idle_label)
-
         # Slider in minutes (0-30)
-        self.idle_time_slider = NSSlider.alloc().initWithFrame_(NSMakeRect(180, y, 150, 24))
+        self.idle_time_slider = NSSlider.alloc().initWithFrame_(((180, y), (150, 24)))
         self.idle_time_slider.setMinValue_(0)
         self.idle_time_slider.setMaxValue_(30)
         idle_minutes = self.config.telegram_idle_time_required // 60
         self.idle_time_slider.setIntValue_(idle_minutes)
         self.idle_time_slider.setTarget_(self)
-        self.idle_time_slider.setAction_(objc.selector(self.idleTimeChanged_, signature=b"v@:@"))
-        view.addSubview_(self.idle_time_slider)
+        self.idle_time_slider.setAction_("idleTimeChanged:")
+        subviews.append(self.idle_time_slider)
 
         idle_text = "Always" if idle_minutes == 0 else f"{idle_minutes} min"
-        self.idle_time_value = self._create_label(idle_text, NSMakeRect(340, y, 50, 20))
-        view.addSubview_(self.idle_time_value)
+        self.idle_time_value = self._create_label(idle_text, ((340, y), (50, 20)))
+        subviews.append(self.idle_time_value)
 
         y -= 20
 
-        idle_hint = self._create_label("Only send to Telegram if computer is idle (0 = always send)", NSMakeRect(20, y, 400, 16))
-        idle_hint.setTextColor_(NSTextField.alloc().init().textColor().colorWithAlphaComponent_(0.5))
-        idle_hint.setFont_(NSFont.systemFontOfSize_(11))
-        view.addSubview_(idle_hint)
+        idle_hint = self._create_label("Only send to Telegram if computer is idle (0 = always send)", ((20, y), (400, 16)))
+        idle_hint.setTextColor_(HINT_COLOR)
+        idle_hint.setFont_(HINT_FONT)
+        subviews.append(idle_hint)
 
         y -= 40
 
-        screen_lock_label = self._create_label("Send when screen locked:", NSMakeRect(20, y, 170, 20))
-        view.addSubview_(screen_lock_label)
-
-        self.screen_lock_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(200, y, 200, 20))
-        self.screen_lock_checkbox.setButtonType_(NSSwitchButton)
-        self.screen_lock_checkbox.setTitle_("")
-        self.screen_lock_checkbox.setState_(
-            NSOnState if self.config.telegram_send_on_screen_lock else NSOffState
+        self.screen_lock_checkbox = self._make_switch(
+            ((200, y), (200, 20)),
+            self.config.telegram_send_on_screen_lock,
+            "notifications.telegram.send_on_screen_lock",
         )
-        self.screen_lock_checkbox.setTarget_(self)
-        self.screen_lock_checkbox.setAction_(objc.selector(self.screenLockChanged_, signature=b"v@:@"))
-        view.addSubview_(self.screen_lock_checkbox)
+        subviews.append(self.screen_lock_checkbox)
 
         y -= 20
 
-        screen_lock_hint = self._create_label("Immediately send when screen is locked (bypasses idle time)", NSMakeRect(20, y, 400, 16))
-        screen_lock_hint.setTextColor_(NSTextField.alloc().init().textColor().colorWithAlphaComponent_(0.5))
-        screen_lock_hint.setFont_(NSFont.systemFontOfSize_(11))
-        view.addSubview_(screen_lock_hint)
-
-        tab.setView_(view)
-        return tab
+        screen_lock_hint = self._create_label("Immediately send when screen is locked (bypasses idle time)", ((20, y), (400, 16)))
+        screen_lock_hint.setTextColor_(HINT_COLOR)
+        screen_lock_hint.setFont_(HINT_FONT)
+        subviews.append(screen_lock_hint)
 
-    def _create_advanced_tab(self) -> NSTabViewItem:
-        """Create the Advanced tab."""
-        tab = NSTabViewItem.alloc().initWithIdentifier_("advanced")
-        tab.setLabel_("Advanced")
+        view.setSubviews_(subviews)
+        return view
 
-        view = NSView.alloc().initWithFrame_(NSMakeRect(0, 0, 440, 400))
+    @objc.python_method
+    def _create_advanced_tab(self) -> NSView:
+        """Create the Advanced tab's view."""
+        view = NSView.alloc().initWithFrame_(((0, 0), (440, 400)))
+        subviews = self._create_labels(LABELS["advanced"])
 
         y = 360
 
         # Notification Types section
-        notif_header = self._create_label("Notification Types:", NSMakeRect(20, y, 200, 20))
-        notif_header.setFont_(NSFont.boldSystemFontOfSize_(13))
-        view.addSubview_(notif_header)
+        notif_header = self._create_label("Notification Types:", ((20, y), (200, 20)))
+        notif_header.setFont_(HEADER_FONT)
+        subviews.append(notif_header)
 
         y -= 30
 
-        idle_label = self._create_label("Idle notifications:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(idle_label)
-
-        self.idle_notif_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 20, 20))
-        self.idle_notif_checkbox.setButtonType_(NSSwitchButton)
-        self.idle_notif_checkbox.setTitle_("")
-        self.idle_notif_checkbox.setState_(
-            NSOnState if self.config.idle_notifications else NSOffState
+        self.idle_notif_checkbox = self._make_switch(
+            ((180, y), (20, 20)), self.config.idle_notifications, "filters.idle_notifications"
         )
-        self.idle_notif_checkbox.setTarget_(self)
-        self.idle_notif_checkbox.setAction_(objc.selector(self.idleNotificationsChanged_, signature=b"v@:@"))
-        view.addSubview_(self.idle_notif_checkbox)
+        subviews.append(self.idle_notif_checkbox)
 
-        idle_hint = self._create_label("When Claude waits for input", NSMakeRect(210, y, 200, 20))
-        idle_hint.setTextColor_(NSTextField.alloc().init().textColor().colorWithAlphaComponent_(0.6))
-        view.addSubview_(idle_hint)
+        idle_hint = self._create_label("When Claude waits for input", ((210, y), (200, 20)))
+        idle_hint.setTextColor_(HINT_COLOR)
+        subviews.append(idle_hint)
 
         y -= 30
 
-        perm_label = self._create_label("Permission notifications:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(perm_label)
-
-        self.perm_notif_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 20, 20))
-        self.perm_notif_checkbox.setButtonType_(NSSwitchButton)
-        self.perm_notif_checkbox.setTitle_("")
-        self.perm_notif_checkbox.setState_(
-            NSOnState if self.config.permission_notifications else NSOffState
+        self.perm_notif_checkbox = self._make_switch(
+            ((180, y), (20, 20)),
+            self.config.permission_notifications,
+            "filters.permission_notifications",
         )
-        self.perm_notif_checkbox.setTarget_(self)
-        self.perm_notif_checkbox.setAction_(objc.selector(self.permNotificationsChanged_, signature=b"v@:@"))
-        view.addSubview_(self.perm_notif_checkbox)
+        subviews.append(self.perm_notif_checkbox)
 
-        perm_hint = self._create_label("When Claude needs permission", NSMakeRect(210, y, 200, 20))
-        perm_hint.setTextColor_(NSTextField.alloc().init().textColor().colorWithAlphaComponent_(0.6))
-        view.addSubview_(perm_hint)
+        perm_hint = self._create_label("When Claude needs permission", ((210, y), (200, 20)))
+        perm_hint.setTextColor_(HINT_COLOR)
+        subviews.append(perm_hint)
 
         y -= 25
 
-        reinstall_note = self._create_label("(Reinstall hook after changing)", NSMakeRect(180, y, 250, 16))
-        reinstall_note.setTextColor_(NSTextField.alloc().init().textColor().colorWithAlphaComponent_(0.4))
-        reinstall_note.setFont_(NSFont.systemFontOfSize_(11))
-        view.addSubview_(reinstall_note)
+        reinstall_note = self._create_label("(Reinstall hook after changing)", ((180, y), (250, 16)))
+        reinstall_note.setTextColor_(NOTE_COLOR)
+        reinstall_note.setFont_(HINT_FONT)
+        subviews.append(reinstall_note)
 
         y -= 50
 
-        debug_label = self._create_label("Debug Logging:", NSMakeRect(20, y, 150, 20))
-        view.addSubview_(debug_label)
-
-        self.debug_checkbox = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 200, 20))
-        self.debug_checkbox.setButtonType_(NSSwitchButton)
-        self.debug_checkbox.setTitle_("")
-        self.debug_checkbox.setState_(NSOnState if self.config.debug else NSOffState)
-        self.debug_checkbox.setTarget_(self)
-        self.debug_checkbox.setAction_(objc.selector(self.debugChanged_, signature=b"v@:@"))
-        view.addSubview_(self.debug_checkbox)
+        self.debug_checkbox = self._make_switch(
+            ((180, y), (200, 20)), self.config.debug, "debug"
+        )
+        subviews.append(self.debug_checkbox)
 
         y -= 40
 
-        logs_btn = NSButton.alloc().initWithFrame_(NSMakeRect(180, y, 100, 30))
-        logs_btn.setTitle_("View Logs")
-        logs_btn.setBezelStyle_(NSBezelStyleRounded)
-        logs_btn.setTarget_(self)
-        logs_btn.setAction_(objc.selector(self.viewLogs_, signature=b"v@:@"))
-        view.addSubview_(logs_btn)
+        logs_btn = self._configure_button(
+            NSButton.alloc().initWithFrame_(((180, y), (100, 30))),
+            title="View Logs",
+            bezel_style=NSBezelStyleRounded,
+            action="viewLogs:",
+        )
+        subviews.append(logs_btn)
 
-        tab.setView_(view)
-        return tab
+        view.setSubviews_(subviews)
+        return view
 
+    @objc.python_method
     def _update_hook_status(self):
-        """Update the hook installation status display."""
-        from ..hooks import is_hook_installed
-
-        if is_hook_installed():
-            self.hook_status.setStringValue_("Installed")
-        else:
-            self.hook_status.setStringValue_("Not installed")
+        """Update the hook installation status display, rechecking it if stale."""
+        if self._hook_installed is None:
+            # Nothing to show yet, so the first check can't be deferred
+            self._set_hook_installed(is_hook_installed())
+            return
 
-    @objc.typedSelector(b"v@:@")
-    def launchAtLoginChanged_(self, sender):
-        self.config.set("launch_at_login", sender.state() == NSOnState)
-        self._notify_changed()
+        self._show_hook_status()
+        if time.monotonic() - self._hook_checked_at > HOOK_STATUS_TTL:
 
-    @objc.typedSelector(b"v@:@")
-    def macosEnabledChanged_(self, sender):
-        self.config.set("notifications.macos.enabled", sender.state() == NSOnState)
-        self._notify_changed()
+            def check():
+                installed = is_hook_installed()
+                NSOperationQueue.mainQueue().addOperationWithBlock_(
+                    lambda: self._set_hook_installed(installed)
+                )
 
-    @objc.typedSelector(b"v@:@")
-    def soundChanged_(self, sender):
-        self.config.set("notifications.macos.sound", sender.titleOfSelectedItem())
-        self._notify_changed()
+            self._network_queue.addOperationWithBlock_(check)
 
-    @objc.typedSelector(b"v@:@")
-    def soundEnabledChanged_(self, sender):
-        self.config.set("notifications.macos.sound_enabled", sender.state() == NSOnState)
-        self._notify_changed()
+    @objc.python_method
+    def _set_hook_installed(self, installed: bool):
+        """Record a fresh hook install state and display it."""
+        self._hook_installed = installed
+        self._hook_checked_at = time.monotonic()
+        self._show_hook_status()
 
-    @objc.typedSelector(b"v@:@")
-    def terminalChanged_(self, sender):
-        self.config.set("notifications.macos.terminal_app", sender.titleOfSelectedItem())
-        self._notify_changed()
+    @objc.python_method
+    def _show_hook_status(self):
+        """Show the last known hook install state, if the General tab exists."""
+        if self.hook_status is None:
+            return
+        if self._hook_installed:
+            self.hook_status.setStringValue_("Installed")
+        else:
+            self.hook_status.setStringValue_("Not installed")
 
     @objc.typedSelector(b"v@:@")
-    def telegramEnabledChanged_(self, sender):
-        self.config.set("notifications.telegram.enabled", sender.state() == NSOnState)
-        self._notify_changed()
+    def controlChanged_(self, sender):
+        """Save a checkbox or popup to the config key held in its identifier."""
+        if isinstance(sender, NSPopUpButton):
+            value = str(sender.titleOfSelectedItem())
+        else:
+            value = sender.state() == NSOnState
+        self._update_config(str(sender.identifier()), value)
 
     @objc.typedSelector(b"v@:@")
     def testTelegram_(self, sender):
@@ -507,80 +630,61 @@ class PreferencesWindowController(NSObject):
             self._show_alert("Error", "Please enter both Bot Token and Chat ID")
             return
 
-        self.config.set("notifications.telegram.bot_token", token)
-        self.config.set("notifications.telegram.chat_id", chat_id)
+        def test():
+            success, message = test_telegram_connection_sync(token, chat_id)
 
-        # Synchronous call (brief freeze but safe)
-        success, message = test_telegram_connection_sync(token, chat_id)
-        if success:
-            self._show_alert("Success", f"Telegram connection working!\n{message}")
-        else:
-            self._show_alert("Error", f"Connection failed:\n{message}")
+            def show_result():
+                if success:
+                    # Only credentials that just worked are saved
+                    self._save_telegram_credentials(token, chat_id)
+                    self._show_alert("Success", f"Telegram connection working!\n{message}")
+                else:
+                    self._show_alert("Error", f"Connection failed:\n{message}")
+
+            # Alerts must be run from the main thread
+            NSOperationQueue.mainQueue().addOperationWithBlock_(show_result)
+
+        # Run the network round trips off the main thread so the window stays responsive
+        self._network_queue.addOperationWithBlock_(test)
+
+    @objc.python_method
+    def _save_telegram_credentials(self, token: str, chat_id: str):
+        """Store the bot token and chat ID."""
+        self._apply_changes({
+            "notifications.telegram.bot_token": token,
+            "notifications.telegram.chat_id": chat_id,
+        })
 
     @objc.typedSelector(b"v@:@")
     def getChatId_(self, sender):
         """Fetch chat ID from Telegram bot's recent messages."""
-        import requests
-
         # Convert NSString to Python str
         token = str(self.token_field.stringValue())
         if not token:
             self._show_alert("Error", "Please enter the Bot Token first")
             return
 
-        # Synchronous call (brief freeze but safe)
-        try:
-            url = f"https://api.telegram.org/bot{token}/getUpdates"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-
-            if not data.get("ok"):
-                self._show_alert("Error", f"API error: {data.get('description', 'Unknown error')}")
-                return
-
-            results = data.get("result", [])
-            if not results:
-                self._show_alert("Error", "No messages found.\n\n1. Send a message to your bot first\n2. Then click 'Get Chat ID' again")
-                return
+        def fetch():
+            chat_id, message = fetch_chat_id_sync(token)
 
-            # Get chat ID from the most recent message
-            for update in reversed(results):
-                msg = update.get("message") or update.get("edited_message")
-                if msg and msg.get("chat"):
-                    chat_id = str(msg["chat"]["id"])
-                    self.chat_field.setStringValue_(chat_id)
-                    self._show_alert("Success", f"Chat ID found: {chat_id}")
+            def show_result():
+                if chat_id is None:
+                    self._show_alert("Error", message)
                     return
+                if self.chat_field is not None:
+                    self.chat_field.setStringValue_(chat_id)
+                self._show_alert("Success", message)
 
-            self._show_alert("Error", "No chat found in recent messages")
-
-        except Exception as e:
-            self._show_alert("Error", f"Error: {e}")
+            NSOperationQueue.mainQueue().addOperationWithBlock_(show_result)
 
-    @objc.typedSelector(b"v@:@")
-    def contextChanged_(self, sender):
-        self.config.set(
-            "notifications.telegram.include_context", sender.state() == NSOnState
-        )
-        self._notify_changed()
+        self._network_queue.addOperationWithBlock_(fetch)
 
     @objc.typedSelector(b"v@:@")
     def linesChanged_(self, sender):
         value = int(sender.intValue())
         text = "All" if value >= 100 else str(value)
         self.lines_value.setStringValue_(text)
-        self.config.set("notifications.telegram.context_lines", value)
-        self._notify_changed()
-
-    @objc.typedSelector(b"v@:@")
-    def idleNotificationsChanged_(self, sender):
-        self.config.set("filters.idle_notifications", sender.state() == NSOnState)
-        self._notify_changed()
-
-    @objc.typedSelector(b"v@:@")
-    def permNotificationsChanged_(self, sender):
-        self.config.set("filters.permission_notifications", sender.state() == NSOnState)
-        self._notify_changed()
+        self._queue_config("notifications.telegram.context_lines", value)
 
     @objc.typedSelector(b"v@:@")
     def idleTimeChanged_(self, sender):
@@ -588,25 +692,10 @@ class PreferencesWindowController(NSObject):
         text = "Always" if minutes == 0 else f"{minutes} min"
         self.idle_time_value.setStringValue_(text)
         # Store in seconds
-        self.config.set("notifications.telegram.idle_time_required", minutes * 60)
-        self._notify_changed()
-
-    @objc.typedSelector(b"v@:@")
-    def screenLockChanged_(self, sender):
-        self.config.set("notifications.telegram.send_on_screen_lock", sender.state() == NSOnState)
-        self._notify_changed()
-
-    @objc.typedSelector(b"v@:@")
-    def debugChanged_(self, sender):
-        self.config.set("debug", sender.state() == NSOnState)
-        self._notify_changed()
+        self._queue_config("notifications.telegram.idle_time_required", minutes * 60)
 
     @objc.typedSelector(b"v@:@")
     def viewLogs_(self, sender):
-        import subprocess
-
-        from ..config import get_log_path
-
         log_path = get_log_path()
         if log_path.exists():
             subprocess.run(["open", "-a", "Console", str(log_path)])
@@ -615,18 +704,17 @@ class PreferencesWindowController(NSObject):
 
     @objc.typedSelector(b"v@:@")
     def installHook_(self, sender):
-        from ..hooks import install_hook
-
         success, message = install_hook(
             idle_notifications=self.config.idle_notifications,
             permission_notifications=self.config.permission_notifications,
         )
         if success:
             self._show_alert("Success", message)
-            self._update_hook_status()
+            self._set_hook_installed(True)
         else:
             self._show_alert("Error", message)
 
+    @objc.python_method
     def _show_alert(self, title: str, message: str):
         """Show an alert dialog."""
         alert = NSAlert.alloc().init()
@@ -635,23 +723,75 @@ class PreferencesWindowController(NSObject):
         alert.addButtonWithTitle_("OK")
         alert.runModal()
 
+    @objc.python_method
+    def _update_config(self, key: str, value):
+        """Store a setting and notify listeners, unless it already has that value."""
+        self._apply_changes({key: value})
+
+    @objc.python_method
+    def _apply_changes(self, changes: dict):
+        """Store settings that differ from the config, then notify listeners once."""
+        changed = False
+        for key, value in changes.items():
+            if self.config.get(key) != value:
+                self.config.set(key, value)
+                changed = True
+        if changed:
+            self._notify_changed()
+
+    @objc.python_method
+    def _queue_config(self, key: str, value):
+        """Stage a setting to be saved once the control has been still for a moment."""
+        self._pending_changes[key] = value
+        # The timer is scheduled in the default run loop mode, so it can't fire
+        # while a slider is being dragged
+        if self._flush_timer is not None:
+            self._flush_timer.invalidate()
+        self._flush_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+            SLIDER_SAVE_DELAY, self, "flushConfig:", None, False
+        )
+
+    @objc.typedSelector(b"v@:@")
+    def flushConfig_(self, timer):
+        """Save the staged settings."""
+        self._flush_timer = None
+        changes, self._pending_changes = self._pending_changes, {}
+        self._apply_changes(changes)
+
+    @objc.python_method
     def _notify_changed(self):
         """Notify that config has changed."""
         if self.on_config_changed:
             self.on_config_changed()
 
+    @objc.python_method
+    def _install_edit_menu(self):
+        """Make our Edit menu the main menu, building it on first use."""
+        # Text fields only get Cmd+X/C/V/A through these menu key equivalents;
+        # an accessory app has no main menu of its own to provide them
+        if self._menubar is None:
+            menubar = NSMenu.alloc().init()
+            menubar.addItem_(NSMenuItem.alloc().init())  # Application menu
+
+            edit_menu = NSMenu.alloc().initWithTitle_("Edit")
+            for item in EDIT_MENU_ITEMS:
+                if item is None:
+                    edit_menu.addItem_(NSMenuItem.separatorItem())
+                else:
+                    edit_menu.addItem_(NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(*item))
+
+            edit_menu_item = NSMenuItem.alloc().init()
+            edit_menu_item.setSubmenu_(edit_menu)
+            menubar.addItem_(edit_menu_item)
+            self._menubar = menubar
+        NSApp.setMainMenu_(self._menubar)
+
     def showWindow_(self, sender):
         """Show the preferences window."""
-        from AppKit import (
-            NSApplicationActivationPolicyRegular,
-            NSMenu,
-            NSMenuItem,
-        )
-
         # If window is already visible, just bring to front
         try:
             if self.window is not None and self.window.isVisible():
-                from AppKit import NSRunningApplication, NSApplicationActivateIgnoringOtherApps
+                self._install_edit_menu()
                 NSApp.activateIgnoringOtherApps_(True)
                 self.window.makeKeyAndOrderFront_(None)
                 self.window.orderFrontRegardless()
@@ -661,42 +801,23 @@ class PreferencesWindowController(NSObject):
         except Exception as e:
             logger.warning(f"Error checking window visibility: {e}")
 
+        # Closing the window releases its tabs; build them again
+        if self._tab_view is None:
+            self._create_tabs()
+
         # Temporarily become a regular app to show the window
         NSApp.setActivationPolicy_(NSApplicationActivationPolicyRegular)
 
-        # Only create Edit menu once
-        if not getattr(self, '_menu_initialized', False):
-            menubar = NSMenu.alloc().init()
-            app_menu_item = NSMenuItem.alloc().init()
-            menubar.addItem_(app_menu_item)
-
-            edit_menu_item = NSMenuItem.alloc().init()
-            menubar.addItem_(edit_menu_item)
-
-            edit_menu = NSMenu.alloc().initWithTitle_("Edit")
-
-            cut_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("Cut", "cut:", "x")
-            copy_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("Copy", "copy:", "c")
-            paste_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("Paste", "paste:", "v")
-            select_all_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("Select All", "selectAll:", "a")
-
-            edit_menu.addItem_(cut_item)
-            edit_menu.addItem_(copy_item)
-            edit_menu.addItem_(paste_item)
-            edit_menu.addItem_(NSMenuItem.separatorItem())
-            edit_menu.addItem_(select_all_item)
-
-            edit_menu_item.setSubmenu_(edit_menu)
-            NSApp.setMainMenu_(menubar)
-            self._menu_initialized = True
+        self._install_edit_menu()
 
         # Activate app and bring window to front
-        from AppKit import NSRunningApplication, NSApplicationActivateIgnoringOtherApps
-
         NSApp.activateIgnoringOtherApps_(True)
         self.window.makeKeyAndOrderFront_(None)
         self.window.orderFrontRegardless()
 
+        # Check the hook on the next run loop pass, once the window has drawn
+        NSOperationQueue.mainQueue().addOperationWithBlock_(self._update_hook_status)
+
         # Also activate via NSRunningApplication for good measure
         current_app = NSRunningApplication.currentApplication()
         current_app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
@@ -706,25 +827,12 @@ _prefs_controller = None
 
 
 def show_preferences(config, on_changed=None):
-    """Show the preferences window."""
+    """Show the preferences window, reusing one controller and window across calls."""
     global _prefs_controller
-    try:
-        # Check if existing controller is still valid
-        if _prefs_controller is not None:
-            try:
-                # Try to access window - will fail if deallocated
-                _ = _prefs_controller.window
-            except Exception:
-                _prefs_controller = None
-
-        if _prefs_controller is None:
-            _prefs_controller = PreferencesWindowController.alloc().initWithConfig_(config)
-            _prefs_controller.on_config_changed = on_changed
-        _prefs_controller.showWindow_(None)
-    except Exception as e:
-        logger.error(f"Error showing preferences: {e}")
-        # Reset and try again
-        _prefs_controller = None
+    if _prefs_controller is None:
         _prefs_controller = PreferencesWindowController.alloc().initWithConfig_(config)
-        _prefs_controller.on_config_changed = on_changed
+    _prefs_controller.on_config_changed = on_changed
+    try:
         _prefs_controller.showWindow_(None)
+    except Exception:
+        logger.exception("Error showing preferences")